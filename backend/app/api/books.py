@@ -4,6 +4,7 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 import httpx
 
+from app.core import open_library
 from app.core.security import get_current_active_user
 from app.models.user import User
 from app.schemas.books import BookSearchResponse, BookDetailResponse
@@ -46,22 +47,18 @@ async def search_books(
         if page > 1:
             params["page"] = page
             
-        async with httpx.AsyncClient() as client:
-            response = await client.get(OPEN_LIBRARY_SEARCH_URL, params=params)
-            response.raise_for_status()  # Raise exception for 4XX/5XX responses
-            
-            search_results = response.json()
-            
-            # Log successful search
-            logger.info(f"Found {search_results.get('numFound', 0)} books matching query: {query}")
-            
-            return {
-                "docs": search_results.get("docs", []),
-                "numFound": search_results.get("numFound", 0),
-                "page": page,
-                "limit": limit,
-            }
-            
+        search_results = await open_library.get_json(OPEN_LIBRARY_SEARCH_URL, params=params, endpoint="search")
+        
+        # Log successful search
+        logger.info(f"Found {search_results.get('numFound', 0)} books matching query: {query}")
+        
+        return {
+            "docs": search_results.get("docs", []),
+            "numFound": search_results.get("numFound", 0),
+            "page": page,
+            "limit": limit,
+        }
+        
     except httpx.HTTPError as e:
         logger.error(f"Error searching Open Library API: {str(e)}")
         raise HTTPException(
@@ -88,31 +85,27 @@ async def get_book_details(
     logger.info(f"Fetching details for book ID: {book_id}")
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{OPEN_LIBRARY_WORKS_URL}/{book_id}.json")
-            response.raise_for_status()
-            
-            book_data = response.json()
-            
-            # Log successful fetch
-            logger.info(f"Successfully fetched details for book: {book_data.get('title', 'Unknown')}")
-            
-            # Enhance with cover info if available
-            cover_id = book_data.get("covers", [None])[0] if "covers" in book_data else None
-            
-            return {
-                "id": book_id,
-                "title": book_data.get("title", "Unknown Title"),
-                "authors": book_data.get("authors", []),
-                "description": book_data.get("description", {}).get("value", "") 
-                    if isinstance(book_data.get("description", {}), dict) 
-                    else book_data.get("description", ""),
-                "subjects": book_data.get("subjects", []),
-                "created": book_data.get("created", {}).get("value", ""),
-                "last_modified": book_data.get("last_modified", {}).get("value", ""),
-                "cover_id": cover_id,
-            }
-            
+        book_data = await open_library.get_json(f"{OPEN_LIBRARY_WORKS_URL}/{book_id}.json", endpoint="work")
+        
+        # Log successful fetch
+        logger.info(f"Successfully fetched details for book: {book_data.get('title', 'Unknown')}")
+        
+        # Enhance with cover info if available
+        cover_id = book_data.get("covers", [None])[0] if "covers" in book_data else None
+        
+        return {
+            "id": book_id,
+            "title": book_data.get("title", "Unknown Title"),
+            "authors": book_data.get("authors", []),
+            "description": book_data.get("description", {}).get("value", "") 
+                if isinstance(book_data.get("description", {}), dict) 
+                else book_data.get("description", ""),
+            "subjects": book_data.get("subjects", []),
+            "created": book_data.get("created", {}).get("value", ""),
+            "last_modified": book_data.get("last_modified", {}).get("value", ""),
+            "cover_id": cover_id,
+        }
+        
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             logger.warning(f"Book not found: {book_id}")
@@ -1,48 +1,50 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import timedelta
 
-from ...db.database import get_db
+from ...db.database import get_async_db
 from ...models.user import User
 from ...schemas.user import UserCreate, UserResponse, Token
-from ...core.security import create_access_token
+from ...core.security import create_access_token, get_password_hash_async, verify_password_async
 from ...core.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-def register_user(user_data: UserCreate, db: Session = Depends(get_db), request: Request = None):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db), request: Request = None):
     """
     Register a new user and return JWT token
     """
     if request:
-        logger.info(f"Registration request from {request.client.host} with headers: {request.headers}")
+        logger.info("Registration request from %s", request.client.host)
+        logger.debug("Registration request headers: %s", request.headers)
         
-    logger.info(f"Registering user with email: {user_data.email} and username: {user_data.username}")
+    logger.info("Registering user with email: %s and username: %s", user_data.email, user_data.username)
     
     # Check if email already exists
-    db_user_email = db.query(User).filter(User.email == user_data.email).first()
+    db_user_email = (await db.exec(select(User).where(User.email == user_data.email))).first()
     if db_user_email:
-        logger.warning(f"Registration failed: Email {user_data.email} already registered")
+        logger.warning("Registration failed: Email %s already registered", user_data.email)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Check if username already exists
-    db_user_username = db.query(User).filter(User.username == user_data.username).first()
+    db_user_username = (await db.exec(select(User).where(User.username == user_data.username))).first()
     if db_user_username:
-        logger.warning(f"Registration failed: Username {user_data.username} already taken")
+        logger.warning("Registration failed: Username %s already taken", user_data.username)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    # Create new user
-    hashed_password = User.get_password_hash(user_data.password)
+    # Create new user (bcrypt is CPU-bound, keep it off the event loop)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -50,8 +52,8 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db), request:
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Generate access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -60,7 +62,7 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db), request:
         expires_delta=access_token_expires
     )
     
-    logger.info(f"User {user_data.username} registered successfully")
+    logger.info("User %s registered successfully", user_data.username)
     
     return {
         "access_token": access_token,
@@ -69,15 +71,15 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db), request:
     }
 
 @router.post("/login", response_model=Token)
-def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """
     Login a user and return JWT token
     """
     # Find user by username
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = (await db.exec(select(User).where(User.username == form_data.username))).first()
     
     # Check if user exists and password is correct
-    if not user or not user.verify_password(form_data.password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password, user.username):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
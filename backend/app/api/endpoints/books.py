@@ -1,27 +1,249 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import SQLAlchemyError
+import asyncio
 import httpx
 import logging
 from typing import Optional, List
 
+from ...core import open_library
+from ...core.cache import create_cache
+from ...core.singleflight import SingleFlight
 from ...core.config import settings
+from ...core.http_cache import compute_etag, http_date, is_not_modified
+from ...core.rate_limiter import BACKGROUND, INTERACTIVE
+from ...core.search_index import search_index
 from ...core.security import get_current_active_user
+from ...db.catalog import get_author_names, get_work_payload
+from ...db.database import AsyncSessionLocal, db_state
 from ...models.user import User
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+SEARCH_FIELDS = "key,title,author_name,first_publish_year,cover_i,isbn"
+
+# Search and work entries are {"value", "etag", "last_modified"} so expired
+# ones can be revalidated upstream (see cache_entry/fetch_revalidated).
+# The namespaces are versioned because the persistent tier may still hold
+# bare payloads written before entries carried validators.
+
+# Cache of Open Library search results keyed on the normalized search
+search_cache = create_cache(
+    "search.v2",
+    maxsize=settings.SEARCH_CACHE_MAX_SIZE,
+    ttl=settings.SEARCH_CACHE_TTL,
+    stale_ttl=max(
+        settings.SEARCH_CACHE_STALE_TTL,
+        settings.SEARCH_STALE_WHILE_REVALIDATE,
+        settings.SEARCH_STALE_IF_ERROR,
+    ),
+)
+
+# Raw Open Library work payloads keyed by work ID
+work_cache = create_cache(
+    "works.v2",
+    maxsize=settings.WORK_CACHE_MAX_SIZE,
+    ttl=settings.WORK_CACHE_TTL,
+    stale_ttl=max(
+        settings.WORK_CACHE_STALE_TTL,
+        settings.BOOK_DETAILS_STALE_WHILE_REVALIDATE,
+        settings.BOOK_DETAILS_STALE_IF_ERROR,
+    ),
+)
+
+# Author names rarely change, so they are kept much longer than searches
+author_cache = create_cache("authors", maxsize=settings.AUTHOR_CACHE_MAX_SIZE, ttl=settings.AUTHOR_CACHE_TTL)
+
+# Coalesces concurrent identical upstream fetches into one request
+upstream_flights = SingleFlight()
+
+
+def search_cache_key(search_field: str, query: str, page: int, limit: int, fields: str = SEARCH_FIELDS):
+    """Normalize a search so equivalent queries share a cache entry"""
+    normalized_query = " ".join(query.split()).lower()
+    return (search_field, normalized_query, page, limit, fields)
+
+def cache_entry(value, etag: Optional[str] = None, last_modified: Optional[str] = None) -> dict:
+    return {"value": value, "etag": etag, "last_modified": last_modified}
+
+async def fetch_revalidated(cache, key, endpoint: str, url: str, previous: Optional[dict] = None, params: Optional[dict] = None, build=None):
+    """
+    Fetch an upstream payload into cache. If we still hold an expired
+    entry (previous), send its validators so an unchanged payload costs a
+    304, which only refreshes the entry's TTL. build turns the decoded
+    JSON into the value that is cached and returned.
+    """
+    response = await open_library.get_json_conditional(
+        url,
+        params=params,
+        etag=previous["etag"] if previous else None,
+        last_modified=previous["last_modified"] if previous else None,
+        endpoint=endpoint,
+    )
+    if response.not_modified:
+        entry = cache_entry(previous["value"], response.etag, response.last_modified)
+    else:
+        value = build(response.data) if build else response.data
+        entry = cache_entry(value, response.etag, response.last_modified)
+    cache.set(key, entry)
+    return entry["value"]
+
+def _log_refresh_failure(task: "asyncio.Task") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background refresh failed: %s", task.exception())
+
+async def serve_cached(cache, key, flight_key, fetch, stale_while_revalidate: int, stale_if_error: int):
+    """
+    Return a cached value, calling fetch(previous_entry) through the
+    single-flight group when it is missing or expired.
+
+    Entries at most stale_while_revalidate seconds past expiry are
+    returned immediately while fetch refreshes them in the background;
+    entries at most stale_if_error seconds past expiry are returned if
+    the upstream fetch fails.
+    """
+    entry = await cache.aget(key)
+    if entry is not None:
+        return entry["value"]
+    
+    stale = await cache.aget_stale(key)
+    previous = stale[0] if stale is not None else None
+    if stale is not None and stale[1] <= stale_while_revalidate:
+        # Nobody is waiting on the refresh, so it queues behind user requests
+        with open_library.priority(BACKGROUND):
+            task = upstream_flights.start(flight_key, lambda: fetch(previous))
+        task.add_done_callback(_log_refresh_failure)
+        return previous["value"]
+    
+    try:
+        return await upstream_flights.do(flight_key, lambda: fetch(previous))
+    except httpx.HTTPError as e:
+        if stale is not None and stale[1] <= stale_if_error:
+            logger.warning("Serving stale %s after upstream error: %s", flight_key, e)
+            return previous["value"]
+        raise
+
+async def _load_local_work(clean_id: str) -> Optional[dict]:
+    async with AsyncSessionLocal() as db:
+        return await get_work_payload(db, clean_id)
+
+async def _load_local_author_names(author_keys: List[str]) -> dict:
+    async with AsyncSessionLocal() as db:
+        return await get_author_names(db, author_keys)
+
+async def fetch_local(loader, *args):
+    """
+    Run a local catalog lookup, treating DB errors and slow lookups as a
+    miss. It is skipped until the database has come up, so an unreachable
+    database never delays the upstream fetch by a connect timeout.
+    """
+    if not settings.LOCAL_CATALOG_ENABLED or not db_state.ready:
+        return None
+    try:
+        return await asyncio.wait_for(loader(*args), settings.LOCAL_CATALOG_TIMEOUT)
+    except (SQLAlchemyError, asyncio.TimeoutError) as e:
+        logger.warning("Local catalog lookup failed: %s", str(e) or type(e).__name__)
+        return None
+
+async def fetch_author_name(author_key: str) -> str:
+    """Look up an author's display name upstream, falling back to the key on failure"""
+    async def fetch_author():
+        author_data = await open_library.get_json(settings.OPEN_LIBRARY_AUTHOR_URL.format(author_key), endpoint="author")
+        name = author_data.get("name") or author_data.get("personal_name") or author_key
+        author_cache.set(author_key, name)
+        return name
+    
+    try:
+        return await upstream_flights.do(("author", author_key), fetch_author)
+    except httpx.HTTPError as e:
+        logger.warning("Could not resolve author %s: %s", author_key, e)
+        return author_key
+
+async def resolve_authors(author_keys: List[str]) -> List[dict]:
+    """
+    Resolve author names from the cache, then the local catalog, then
+    Open Library; each tier is asked for all missing authors at once, so
+    a work costs at most one round trip per tier
+    """
+    cached = await author_cache.aget_many(author_keys)
+    names = {key: cached.get(key) for key in author_keys}
+    
+    missing = [key for key, name in names.items() if name is None]
+    if missing:
+        local_names = await fetch_local(_load_local_author_names, missing) or {}
+        for key, name in local_names.items():
+            author_cache.set(key, name)
+            names[key] = name
+    
+    missing = [key for key, name in names.items() if name is None]
+    if missing:
+        fetched = await asyncio.gather(*(fetch_author_name(key) for key in missing))
+        names.update(zip(missing, fetched))
+    
+    return [{"key": key, "name": names[key]} for key in author_keys]
+
+async def fetch_work(clean_id: str) -> dict:
+    """
+    Get a raw work payload from the cache, the local catalog, or
+    Open Library, in that order
+    """
+    async def fetch(previous):
+        data = await fetch_local(_load_local_work, clean_id)
+        if data is not None:
+            work_cache.set(clean_id, cache_entry(data))
+            return data
+        url = settings.OPEN_LIBRARY_BOOK_URL.format(clean_id)
+        logger.info("Making request to: %s", url)
+        return await fetch_revalidated(work_cache, clean_id, "work", url, previous)
+    
+    return await serve_cached(
+        work_cache,
+        clean_id,
+        ("work", clean_id),
+        fetch,
+        stale_while_revalidate=settings.BOOK_DETAILS_STALE_WHILE_REVALIDATE,
+        stale_if_error=settings.BOOK_DETAILS_STALE_IF_ERROR,
+    )
+
+def close_caches():
+    """Flush queued persistent-cache writes; called on shutdown"""
+    for cache in (search_cache, work_cache, author_cache):
+        cache.close()
+
+def warm_search_index():
+    """Index the search results still held in the persistent cache"""
+    for _, entry in search_cache.items():
+        search_index.add_many(entry["value"].get("docs", []))
+
+def search_local(query: str, search_field: str, page: int, limit: int) -> dict:
+    """Answer a search from the local index"""
+    num_found, docs = search_index.search(query, search_field, limit=limit, offset=(page - 1) * limit)
+    return {
+        "numFound": num_found,
+        "docs": docs,
+        "page": page,
+        "limit": limit,
+        "source": "local"
+    }
+
 @router.get("/search")
 async def search_books(
     query: str = Query(..., description="Search query"),
     type: str = Query("title", description="Search type (title, author, isbn)"),
     page: int = Query(1, description="Page number"),
     limit: int = Query(10, description="Results per page"),
+    source: str = Query("remote", description="Search source (local, remote, hybrid)"),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Search books via Open Library API
+
+    `local` answers from the index of books we have already seen, `remote`
+    asks Open Library, and `hybrid` answers locally when the index fills
+    the page and otherwise goes upstream, falling back to local results
+    if Open Library fails.
     """
-    logger.info(f"User {current_user.username} searching for {query} by {type}")
+    logger.info("User %s searching for %s by %s (%s)", current_user.username, query, type, source)
     
     # Map our search type to Open Library's search fields
     field_map = {
@@ -32,6 +254,14 @@ async def search_books(
     
     search_field = field_map.get(type, "q")
     
+    if source not in ("local", "remote", "hybrid"):
+        raise HTTPException(status_code=400, detail="Invalid search source")
+    
+    if source != "remote":
+        local_result = search_local(query, search_field, page, limit)
+        if source == "local" or len(local_result["docs"]) >= limit:
+            return local_result
+    
     # Calculate offset for pagination
     offset = (page - 1) * limit
     
@@ -40,83 +270,134 @@ async def search_books(
         search_field: query,
         "limit": limit,
         "offset": offset,
-        "fields": "key,title,author_name,first_publish_year,cover_i,isbn",
+        "fields": SEARCH_FIELDS,
         "mode": "everything"
     }
     
-    logger.info(f"Making request to Open Library: {params}")
+    cache_key = search_cache_key(search_field, query, page, limit)
+    
+    def build_result(data):
+        result = {
+            "numFound": data.get("numFound", 0),
+            "docs": data.get("docs", []),
+            "page": page,
+            "limit": limit,
+            "source": "remote"
+        }
+        search_index.add_many(result["docs"])
+        return result
+    
+    async def fetch_search(previous):
+        logger.info("Making request to Open Library: %s", params)
+        return await fetch_revalidated(
+            search_cache, cache_key, "search", settings.OPEN_LIBRARY_SEARCH_URL, previous, params=params, build=build_result
+        )
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(settings.OPEN_LIBRARY_SEARCH_URL, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"Found {data.get('numFound', 0)} results")
-            
-            return {
-                "numFound": data.get("numFound", 0),
-                "docs": data.get("docs", []),
-                "page": page,
-                "limit": limit
-            }
+        result = await serve_cached(
+            search_cache,
+            cache_key,
+            ("search", cache_key),
+            fetch_search,
+            stale_while_revalidate=settings.SEARCH_STALE_WHILE_REVALIDATE,
+            stale_if_error=settings.SEARCH_STALE_IF_ERROR,
+        )
+        logger.info("Found %s results", result['numFound'])
+        
+        return result
     except httpx.HTTPError as e:
-        logger.error(f"HTTP error occurred: {e}")
+        logger.error("HTTP error occurred: %s", e)
+        if source == "hybrid":
+            logger.info("Falling back to local search results")
+            return local_result
         raise HTTPException(status_code=503, detail=f"Error communicating with Open Library API: {str(e)}")
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: User = Depends(get_current_active_user)):
+    """
+    Get hit/miss counters for the Open Library caches
+    """
+    return {
+        "search": search_cache.stats(),
+        "works": work_cache.stats(),
+        "authors": author_cache.stats(),
+        "in_flight": upstream_flights.stats(),
+        "upstream": open_library.stats(),
+        "search_index": search_index.stats(),
+    }
+
 @router.get("/{book_id}")
 async def get_book_details(
     book_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Get book details via Open Library API
+    Get book details via Open Library API.
+
+    Responses carry a strong ETag and Last-Modified; conditional requests
+    that still match get an empty 304.
     """
     # Clean the book ID if it contains a path prefix
     clean_id = book_id.replace("/works/", "")
     
-    logger.info(f"User {current_user.username} fetching book details for {clean_id}")
+    logger.info("User %s fetching book details for %s", current_user.username, clean_id)
     
     try:
-        # Get book details
-        async with httpx.AsyncClient() as client:
-            url = settings.OPEN_LIBRARY_BOOK_URL.format(clean_id)
-            logger.info(f"Making request to: {url}")
-            
-            response = await client.get(url)
-            response.raise_for_status()
-            
-            book_data = response.json()
-            
-            # Extract and format the data
-            book_details = {
-                "id": clean_id,
-                "title": book_data.get("title", "Unknown Title"),
-                "description": book_data.get("description", {}).get("value", "") if isinstance(book_data.get("description"), dict) else book_data.get("description", ""),
-                "subjects": book_data.get("subjects", []),
-                "created": book_data.get("created", {}).get("value", "") if isinstance(book_data.get("created"), dict) else "",
-                "last_modified": book_data.get("last_modified", {}).get("value", "") if isinstance(book_data.get("last_modified"), dict) else "",
-                "cover_id": book_data.get("covers", [None])[0] if book_data.get("covers") else None,
-            }
-            
-            # Get author details if available
-            authors = []
-            if "authors" in book_data and isinstance(book_data["authors"], list):
-                for author in book_data["authors"]:
-                    if "author" in author and "key" in author["author"]:
-                        # We could fetch author details, but for simplicity we'll just use the key
-                        author_key = author["author"]["key"].split("/")[-1]
-                        authors.append({"name": author_key})
-            
-            book_details["authors"] = authors
-            
-            return book_details
+        # Detail views are interactive and go ahead of queued background fetches
+        with open_library.priority(INTERACTIVE):
+            book_data = await fetch_work(clean_id)
+        
+        # Extract and format the data
+        book_details = {
+            "id": clean_id,
+            "title": book_data.get("title", "Unknown Title"),
+            "description": book_data.get("description", {}).get("value", "") if isinstance(book_data.get("description"), dict) else book_data.get("description", ""),
+            "subjects": book_data.get("subjects", []),
+            "created": book_data.get("created", {}).get("value", "") if isinstance(book_data.get("created"), dict) else "",
+            "last_modified": book_data.get("last_modified", {}).get("value", "") if isinstance(book_data.get("last_modified"), dict) else "",
+            "cover_id": book_data.get("covers", [None])[0] if book_data.get("covers") else None,
+        }
+        
+        # Get author details if available
+        author_keys = []
+        if "authors" in book_data and isinstance(book_data["authors"], list):
+            for author in book_data["authors"]:
+                if "author" in author and "key" in author["author"]:
+                    author_keys.append(author["author"]["key"].split("/")[-1])
+        
+        with open_library.priority(INTERACTIVE):
+            book_details["authors"] = await resolve_authors(author_keys)
+        
+        search_index.add({
+            "key": f"/works/{clean_id}",
+            "title": book_details["title"],
+            "author_name": [author["name"] for author in book_details["authors"]],
+            "cover_i": book_details["cover_id"],
+        })
+        
+        headers = {
+            "ETag": compute_etag(book_details),
+            "Cache-Control": settings.BOOK_DETAILS_CACHE_CONTROL,
+            # Authenticated endpoint: shared caches must key on the credentials
+            "Vary": "Authorization",
+        }
+        last_modified = http_date(book_details["last_modified"])
+        if last_modified:
+            headers["Last-Modified"] = last_modified
+        
+        if is_not_modified(request, headers["ETag"], last_modified):
+            return Response(status_code=304, headers=headers)
+        
+        response.headers.update(headers)
+        return book_details
     except httpx.HTTPError as e:
-        logger.error(f"HTTP error occurred: {e}")
+        logger.error("HTTP error occurred: %s", e)
         raise HTTPException(status_code=503, detail=f"Error communicating with Open Library API: {str(e)}")
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}") 
\ No newline at end of file
@@ -1,73 +1,279 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+import base64
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional, Tuple
 
-from ...db.database import get_db
+from ...db.database import get_async_db
 from ...models.user import User
 from ...models.reading_list import ReadingListItem
-from ...schemas.reading_list import ReadingListItemCreate, ReadingListItemResponse
+from ...schemas.reading_list import (
+    ReadingListItemCreate,
+    ReadingListItemResponse,
+    ReadingListPage,
+    ReadingListBatchCreate,
+    ReadingListBatchCreateResponse,
+    ReadingListBatchDelete,
+    ReadingListBatchDeleteResponse,
+)
+from ...core.config import settings
 from ...core.security import get_current_active_user
+from ...core.search_index import search_index, reading_list_item_doc
 
 router = APIRouter()
 
+UNIQUE_BOOK_CONSTRAINT = "uq_reading_list_items_user_id_book_id"
+
+def is_duplicate_book(error: IntegrityError) -> bool:
+    """True if error is a violation of the unique (user_id, book_id) constraint"""
+    message = str(error.orig)
+    # MySQL names the key (error 1062); SQLite lists the constrained columns
+    return UNIQUE_BOOK_CONSTRAINT in message or (
+        "UNIQUE constraint failed: reading_list_items.user_id, reading_list_items.book_id" in message
+    )
+
+def encode_cursor(item: ReadingListItem) -> str:
+    """Build an opaque cursor pointing just after the given item"""
+    raw = json.dumps([item.added_at.isoformat(), item.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        added_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(added_at), int(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
 @router.get("/", response_model=List[ReadingListItemResponse])
-def get_reading_list(
+async def get_reading_list(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the current user's reading list
     """
-    reading_list = db.query(ReadingListItem).filter(ReadingListItem.user_id == current_user.id).all()
+    reading_list = (await db.exec(
+        select(ReadingListItem).where(ReadingListItem.user_id == current_user.id)
+    )).all()
     return reading_list
 
+@router.get("/page", response_model=ReadingListPage)
+async def get_reading_list_page(
+    limit: int = Query(50, ge=1, le=500, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get one page of the current user's reading list, oldest first.
+
+    Pages are addressed by (added_at, id) rather than an offset, so every
+    page costs one index range scan no matter how deep it is.
+    """
+    query = select(ReadingListItem).where(ReadingListItem.user_id == current_user.id)
+    
+    if cursor:
+        added_at, item_id = decode_cursor(cursor)
+        query = query.where(or_(
+            ReadingListItem.added_at > added_at,
+            and_(ReadingListItem.added_at == added_at, ReadingListItem.id > item_id)
+        ))
+    
+    # Fetch one extra row to know whether another page exists
+    items = (await db.exec(
+        query.order_by(ReadingListItem.added_at, ReadingListItem.id).limit(limit + 1)
+    )).all()
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1])
+    
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.post("/", response_model=ReadingListItemResponse, status_code=status.HTTP_201_CREATED)
-def add_to_reading_list(
+async def add_to_reading_list(
     item: ReadingListItemCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a book to the current user's reading list
     """
-    # Check if book already in reading list
-    existing_item = db.query(ReadingListItem).filter(
-        ReadingListItem.user_id == current_user.id,
-        ReadingListItem.book_id == item.book_id
-    ).first()
-    
-    if existing_item:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Book already in reading list"
-        )
-    
-    # Create new reading list item
+    # Create new reading list item; the unique (user_id, book_id)
+    # constraint rejects duplicates in the same round trip
     db_item = ReadingListItem(
         **item.dict(),
         user_id=current_user.id
     )
     
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_duplicate_book(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Book already in reading list"
+        )
+    await db.refresh(db_item)
+    
+    search_index.add(reading_list_item_doc(db_item))
     
     return db_item
 
+def check_batch_size(size: int):
+    if size > settings.READING_LIST_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.READING_LIST_BATCH_MAX_ITEMS} items per batch"
+        )
+
+@router.post("/batch", response_model=ReadingListBatchCreateResponse)
+async def add_many_to_reading_list(
+    batch: ReadingListBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Add several books to the current user's reading list in one transaction
+    """
+    check_batch_size(len(batch.items))
+    
+    new_rows = {}
+    for item in batch.items:
+        new_rows.setdefault(item.book_id, {**item.dict(), "user_id": current_user.id})
+    if not new_rows:
+        return {"created": 0, "duplicates": 0, "results": []}
+    
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        # MySQL has no INSERT ... RETURNING. The first plain SELECT fixes the
+        # transaction's snapshot (REPEATABLE READ), so rows other requests
+        # commit later stay invisible to us. One INSERT ... ON DUPLICATE KEY
+        # UPDATE then adds the missing keys and skips any a concurrent batch
+        # got to first; of those keys, only the rows we inserted are visible
+        # to the SELECT that follows. No locking reads, so no gap locks for
+        # overlapping batches to deadlock on.
+        existing = set((await db.exec(
+            select(ReadingListItem.book_id).where(
+                ReadingListItem.user_id == current_user.id,
+                ReadingListItem.book_id.in_(list(new_rows))
+            )
+        )).all())
+        # Key order keeps overlapping batches from locking rows in opposite orders
+        rows = [new_rows[book_id] for book_id in sorted(new_rows) if book_id not in existing]
+        created_items = []
+        if rows:
+            await db.exec(
+                mysql_insert(ReadingListItem).values(rows)
+                .on_duplicate_key_update(id=ReadingListItem.id)
+            )
+            created_items = (await db.exec(
+                select(ReadingListItem).where(
+                    ReadingListItem.user_id == current_user.id,
+                    ReadingListItem.book_id.in_([row["book_id"] for row in rows])
+                )
+            )).all()
+    elif dialect == "sqlite":
+        # One multi-row INSERT that skips only rows hitting the unique
+        # (user_id, book_id) key and returns the rows it actually inserted
+        stmt = (
+            sqlite_insert(ReadingListItem)
+            .values(list(new_rows.values()))
+            .on_conflict_do_nothing(index_elements=["user_id", "book_id"])
+            .returning(ReadingListItem)
+        )
+        created_items = (await db.execute(stmt)).scalars().all()
+    else:
+        raise NotImplementedError(f"Batch add is not supported on {dialect}")
+    created = {db_item.book_id: db_item for db_item in created_items}
+    await db.commit()
+    
+    results = []
+    for item in batch.items:
+        db_item = created.pop(item.book_id, None)
+        if db_item is not None:
+            search_index.add(reading_list_item_doc(db_item))
+            results.append({"book_id": item.book_id, "status": "created", "item": db_item})
+        else:
+            results.append({"book_id": item.book_id, "status": "duplicate", "item": None})
+    
+    created_count = sum(1 for result in results if result["status"] == "created")
+    return {
+        "created": created_count,
+        "duplicates": len(results) - created_count,
+        "results": results
+    }
+
+@router.post("/batch/delete", response_model=ReadingListBatchDeleteResponse)
+async def remove_many_from_reading_list(
+    batch: ReadingListBatchDelete,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Remove several items from the current user's reading list in one transaction
+    """
+    check_batch_size(len(batch.ids))
+    
+    # Each id is reported once, in the order it was first given
+    ids = list(dict.fromkeys(batch.ids))
+    
+    found = set((await db.exec(
+        select(ReadingListItem.id).where(
+            ReadingListItem.user_id == current_user.id,
+            ReadingListItem.id.in_(ids)
+        )
+    )).all()) if ids else set()
+    
+    if found:
+        await db.exec(
+            delete(ReadingListItem).where(
+                ReadingListItem.user_id == current_user.id,
+                ReadingListItem.id.in_(found)
+            )
+        )
+    await db.commit()
+    
+    results = [
+        {"id": item_id, "status": "deleted" if item_id in found else "not_found"}
+        for item_id in ids
+    ]
+    return {
+        "deleted": len(found),
+        "not_found": len(results) - len(found),
+        "results": results
+    }
+
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_from_reading_list(
+async def remove_from_reading_list(
     item_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove a book from the current user's reading list
     """
     # Get reading list item
-    item = db.query(ReadingListItem).filter(
-        ReadingListItem.id == item_id,
-        ReadingListItem.user_id == current_user.id
-    ).first()
+    item = (await db.exec(
+        select(ReadingListItem).where(
+            ReadingListItem.id == item_id,
+            ReadingListItem.user_id == current_user.id
+        )
+    )).first()
     
     if not item:
         raise HTTPException(
@@ -76,7 +282,7 @@ def remove_from_reading_list(
         )
     
     # Delete reading list item
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     
     return None 
\ No newline at end of file
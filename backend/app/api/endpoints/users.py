@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from ...db.database import get_db
+from ...db.database import get_async_db
 from ...models.user import User
 from ...schemas.user import UserResponse, UserWithReadingList
 from ...core.security import get_current_active_user
@@ -10,7 +11,7 @@ from ...core.security import get_current_active_user
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(
+async def get_current_user_info(
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -19,12 +20,12 @@ def get_current_user_info(
     return current_user
 
 @router.get("/me/reading-list", response_model=UserWithReadingList)
-def get_current_user_with_reading_list(
+async def get_current_user_with_reading_list(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the current user's profile with reading list
     """
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = (await db.exec(select(User).where(User.id == current_user.id))).first()
     return user 
\ No newline at end of file
@@ -0,0 +1,523 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface shared by the Open Library payload caches"""
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def get_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Return (value, seconds since expiry) for an entry that is fresh
+        or expired but still retained for stale_ttl, or None. The age is
+        zero or negative while the entry is fresh.
+        """
+        raise NotImplementedError
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        """get() for the event loop; backends that do I/O run it off the loop"""
+        return self.get(key, default)
+
+    async def aget_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """get_stale() for the event loop"""
+        return self.get_stale(key)
+
+    async def aget_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Return {key: value} for the keys with a live entry"""
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        """Iterate over live (key, value) pairs"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the backend"""
+
+
+class TTLCache(CacheBackend):
+    """
+    In-process cache with per-entry TTL expiry and LRU eviction.
+
+    Expired entries are kept for another stale_ttl seconds (until LRU
+    eviction) so they can be revalidated or served stale via get_stale.
+    Entries live in a plain OrderedDict with no lock, so an instance must
+    only be used from the event loop, never from the threadpool.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value, or default if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            if now - expires_at > self.stale_ttl:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        age = time.monotonic() - expires_at
+        if age > self.stale_ttl:
+            del self._data[key]
+            return None
+
+        if age > 0:
+            self.stale_hits += 1
+        return value, age
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries if full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        now = time.monotonic()
+        for key, (expires_at, value) in list(self._data.items()):
+            if expires_at > now:
+                yield key, value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Persistent cache stored in a local SQLite file.
+
+    The database runs in WAL mode, so every uvicorn worker on the host can
+    read and write the same file and entries survive restarts. Values must
+    be JSON-serializable. Expiry uses wall-clock time since entries outlive
+    the process that wrote them. Expired rows are kept for stale_ttl
+    seconds before they are purged. Each purge also trims the namespace
+    to max_rows, dropping the rows that expire soonest, so the file can
+    briefly grow past it between purges.
+
+    All SQLite I/O runs on a dedicated worker thread that owns the
+    connection. Writes are queued there without waiting (write-behind);
+    async callers should read through aget/aget_stale so a busy database
+    never stalls the event loop.
+    """
+
+    PURGE_EVERY = 1000  # writes between sweeps of expired rows
+
+    def __init__(self, path: Path, namespace: str, ttl: float, stale_ttl: float = 0, max_rows: int = 100000):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.errors = 0
+        self._writes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"cache-{namespace}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return json.dumps(key)
+
+    def _run(self, fn: Callable, *args) -> Any:
+        """Run fn on the worker thread and wait for it (for sync callers)"""
+        return self._executor.submit(fn, *args).result()
+
+    async def _arun(self, fn: Callable, *args) -> Any:
+        """Run fn on the worker thread without blocking the event loop"""
+        return await asyncio.wrap_future(self._executor.submit(fn, *args))
+
+    def _read(self, key: Hashable) -> Optional[Tuple[str, float]]:
+        try:
+            return self._connect().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, self._encode_key(key)),
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("L2 cache read failed: %s", e)
+            return None
+
+    def _get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        row = self._read(key)
+        if row is None or row[1] <= time.time():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0]), row[1]
+
+    def _get_stale_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        row = self._read(key)
+        now = time.time()
+        if row is None or now - row[1] > self.stale_ttl:
+            return None
+
+        if row[1] <= now:
+            self.stale_hits += 1
+        return json.loads(row[0]), row[1]
+
+    def _get_entries(self, keys: List[Hashable]) -> Dict[Hashable, Tuple[Any, float]]:
+        encoded = {self._encode_key(key): key for key in keys}
+        try:
+            rows = self._connect().execute(
+                "SELECT key, value, expires_at FROM cache_entries"
+                f" WHERE namespace = ? AND key IN ({', '.join('?' * len(encoded))})",
+                (self.namespace, *encoded),
+            ).fetchall()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("L2 cache read failed: %s", e)
+            rows = []
+
+        now = time.time()
+        entries = {
+            encoded[key]: (json.loads(value), expires_at)
+            for key, value, expires_at in rows
+            if expires_at > now
+        }
+        self.hits += len(entries)
+        self.misses += len(encoded) - len(entries)
+        return entries
+
+    async def aget_many_entries(self, keys: Iterable[Hashable]) -> Dict[Hashable, Tuple[Any, float]]:
+        """Return {key: (value, expires_at)} for the live entries, in one query"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        return await self._arun(self._get_entries, keys)
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) for a live entry, or None"""
+        return self._run(self._get_entry, key)
+
+    async def aget_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        return await self._arun(self._get_entry, key)
+
+    def get_stale_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) for a live or retained expired entry, or None"""
+        return self._run(self._get_stale_entry, key)
+
+    async def aget_stale_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        return await self._arun(self._get_stale_entry, key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        entry = await self.aget_entry(key)
+        return default if entry is None else entry[0]
+
+    async def aget_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        entries = await self.aget_many_entries(keys)
+        return {key: value for key, (value, _) in entries.items()}
+
+    @staticmethod
+    def _age(entry: Optional[Tuple[Any, float]]) -> Optional[Tuple[Any, float]]:
+        if entry is None:
+            return None
+        value, expires_at = entry
+        return value, time.time() - expires_at
+
+    def get_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        return self._age(self.get_stale_entry(key))
+
+    async def aget_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        return self._age(await self.aget_stale_entry(key))
+
+    def _write(self, key: Hashable, value: Any, expires_at: float) -> None:
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, self._encode_key(key), json.dumps(value), expires_at),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._purge(conn)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("L2 cache write failed: %s", e)
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time() - self.stale_ttl,))
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache_entries WHERE namespace = ?"
+            " ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_rows),
+        )
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._executor.submit(self._write, key, value, expires_at)
+
+    def _delete(self, key: Hashable) -> None:
+        try:
+            self._connect().execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, self._encode_key(key)),
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("L2 cache delete failed: %s", e)
+
+    def delete(self, key: Hashable) -> None:
+        self._executor.submit(self._delete, key)
+
+    def _clear(self) -> None:
+        try:
+            self._connect().execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("L2 cache clear failed: %s", e)
+
+    def clear(self) -> None:
+        self._executor.submit(self._clear)
+
+    def _scan(self) -> list:
+        try:
+            rows = self._connect().execute(
+                "SELECT key, value FROM cache_entries WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, time.time()),
+            ).fetchall()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("L2 cache scan failed: %s", e)
+            return []
+        return [(json.loads(key), json.loads(value)) for key, value in rows]
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        return iter(self._run(self._scan))
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self) -> None:
+        """Flush queued writes and close the connection"""
+        self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "max_rows": self.max_rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "errors": self.errors,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TieredCache(CacheBackend):
+    """
+    Memory L1 in front of a persistent L2.
+
+    Reads try L1 first and promote L2 hits into L1 for the rest of their
+    lifetime; writes go to both tiers, the L2 write in the background.
+    """
+
+    def __init__(self, l1: TTLCache, l2: SQLiteCache):
+        self.l1 = l1
+        self.l2 = l2
+
+    @property
+    def ttl(self) -> float:
+        return self.l1.ttl
+
+    def _promote(self, key: Hashable, entry: Optional[Tuple[Any, float]], default: Any) -> Any:
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        self.l1.set(key, value, ttl=expires_at - time.time())
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        return self._promote(key, self.l2.get_entry(key), default)
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        return self._promote(key, await self.l2.aget_entry(key), default)
+
+    async def aget_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        values = {}
+        missing = []
+        for key in keys:
+            value = self.l1.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                values[key] = value
+        for key, entry in (await self.l2.aget_many_entries(missing)).items():
+            values[key] = self._promote(key, entry, None)
+        return values
+
+    def _promote_stale(self, key: Hashable, entry, l2_entry) -> Optional[Tuple[Any, float]]:
+        if l2_entry is None:
+            return entry
+
+        value, expires_at = l2_entry
+        remaining = expires_at - time.time()
+        self.l1.set(key, value, ttl=remaining)
+        return value, -remaining
+
+    def get_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        entry = self.l1.get_stale(key)
+        if entry is not None and entry[1] <= 0:
+            return entry
+
+        # Another worker may have refreshed the shared L2 in the meantime
+        return self._promote_stale(key, entry, self.l2.get_stale_entry(key))
+
+    async def aget_stale(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        entry = self.l1.get_stale(key)
+        if entry is not None and entry[1] <= 0:
+            return entry
+        return self._promote_stale(key, entry, await self.l2.aget_stale_entry(key))
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self.l1.set(key, value, ttl)
+        self.l2.set(key, value, ttl)
+
+    def delete(self, key: Hashable) -> None:
+        self.l1.delete(key)
+        self.l2.delete(key)
+
+    def clear(self) -> None:
+        self.l1.clear()
+        self.l2.clear()
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        return self.l2.items()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"l1": self.l1.stats(), "l2": self.l2.stats()}
+
+    def close(self) -> None:
+        self.l2.close()
+
+
+def create_cache(namespace: str, maxsize: int, ttl: float, stale_ttl: float = 0) -> CacheBackend:
+    """
+    Build a payload cache using the backend selected by CACHE_BACKEND
+    ("memory" for L1 only, "tiered" for memory + SQLite)
+    """
+    l1 = TTLCache(maxsize=maxsize, ttl=ttl, stale_ttl=stale_ttl)
+    if settings.CACHE_BACKEND == "memory":
+        return l1
+
+    l2 = SQLiteCache(
+        Path(settings.CACHE_DIR) / settings.CACHE_DB_FILE,
+        namespace=namespace,
+        ttl=ttl,
+        stale_ttl=stale_ttl,
+        max_rows=settings.CACHE_L2_MAX_ROWS,
+    )
+    return TieredCache(l1, l2)
@@ -0,0 +1,182 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a rolling time window of call outcomes.
+
+    Closed: calls go through and their outcome and latency are recorded.
+    Once the window holds at least min_calls, the breaker opens if the
+    error rate or the share of calls slower than slow_call_seconds reaches
+    its threshold.
+    Open: calls are rejected until open_seconds have passed.
+    Half-open: up to half_open_calls probes are let through; one failure
+    reopens the breaker, that many successes close it again.
+
+    allow/record/cancel update the window without locking; open_library
+    calls them around each request on the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float = 30,
+        min_calls: int = 20,
+        error_threshold: float = 0.5,
+        slow_call_seconds: float = 3.0,
+        slow_call_threshold: float = 0.8,
+        open_seconds: float = 30,
+        half_open_calls: int = 3,
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self.rejected = 0
+        self.opened = 0
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()  # (time, failed, slow)
+        self._errors = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def _trim(self, now: float) -> None:
+        while self._calls and self._calls[0][0] <= now - self.window:
+            _, failed, slow = self._calls.popleft()
+            self._errors -= failed
+            self._slow -= slow
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Circuit %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        if state == OPEN:
+            self.opened += 1
+            self._opened_at = time.monotonic()
+        elif state == HALF_OPEN:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        else:
+            self._calls.clear()
+            self._errors = 0
+            self._slow = 0
+
+    def allow(self) -> bool:
+        """Return True if a call may go ahead; it must then be recorded or cancelled"""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_calls - self._probe_successes:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def record(self, ok: bool, latency: float) -> None:
+        """Record the outcome of an allowed call"""
+        slow = latency >= self.slow_call_seconds
+        if self.state == HALF_OPEN:
+            self._probes_in_flight -= 1
+            if not ok or slow:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(CLOSED)
+            return
+
+        if self.state == OPEN:
+            # A call that started before the breaker opened
+            return
+
+        now = time.monotonic()
+        self._calls.append((now, not ok, slow))
+        self._errors += not ok
+        self._slow += slow
+        self._trim(now)
+
+        calls = len(self._calls)
+        if calls >= self.min_calls and (
+            self._errors / calls >= self.error_threshold
+            or self._slow / calls >= self.slow_call_threshold
+        ):
+            self._transition(OPEN)
+
+    def cancel(self) -> None:
+        """Release an allowed call that was abandoned without an outcome"""
+        if self.state == HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        calls = len(self._calls)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "error_rate": self._errors / calls if calls else 0.0,
+            "slow_call_rate": self._slow / calls if calls else 0.0,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of the requests seen in a rolling window,
+    with a small floor so quiet periods can still retry. This keeps
+    retries from multiplying load while the upstream is struggling.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.exhausted = 0
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def _trim(self, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and events[0] <= now - self.window:
+                events.popleft()
+
+    def record_request(self) -> None:
+        self._requests.append(time.monotonic())
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget, returning False if it is used up"""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= max(self.min_retries, self.ratio * len(self._requests)):
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        return {
+            "requests": len(self._requests),
+            "retries": len(self._retries),
+            "exhausted": self.exhausted,
+        }
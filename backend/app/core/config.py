@@ -13,6 +13,18 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     ALGORITHM: str = "HS256"
     
+    # Password hashing
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_CHECKS_PER_ACCOUNT: int = 2  # concurrent login attempts per account
+    
+    # Authenticated user (principal) cache
+    USER_CACHE_TTL: int = 60  # seconds
+    USER_CACHE_MAX_SIZE: int = 10000
+    
+    # Verified token cache
+    TOKEN_CACHE_TTL: int = 60 * 60  # seconds, never beyond the token's exp
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    
     # Database settings
     DB_HOST: str = os.getenv("DB_HOST", "db")
     DB_USER: str = os.getenv("DB_USER", "readinglist")
@@ -20,11 +32,110 @@ class Settings(BaseSettings):
     DB_NAME: str = os.getenv("DB_NAME", "readinglist")
     DB_PORT: str = os.getenv("DB_PORT", "3306")
     DATABASE_URI: Optional[str] = None
+    ASYNC_DATABASE_URI: Optional[str] = os.getenv("ASYNC_DATABASE_URI")  # e.g. sqlite+aiosqlite:///./test.db
+
+    # Connection pool settings (applied to both the sync and async engines)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds, keep below MySQL's wait_timeout
+    DB_POOL_PRE_PING: bool = True
+
+    # Startup readiness wait (exponential backoff between attempts)
+    DB_STARTUP_INITIAL_DELAY: float = 0.5  # seconds
+    DB_STARTUP_MAX_DELAY: float = 10.0  # seconds
+    DB_READINESS_TIMEOUT: float = 2.0  # seconds per ping
+
+    # Run SQLModel create_all on startup (local development without migrations)
+    DB_CREATE_TABLES_ON_STARTUP: bool = False
     
     # Open Library API
     OPEN_LIBRARY_SEARCH_URL: str = "https://openlibrary.org/search.json"
     OPEN_LIBRARY_BOOK_URL: str = "https://openlibrary.org/works/{}.json"
+    OPEN_LIBRARY_AUTHOR_URL: str = "https://openlibrary.org/authors/{}.json"
     OPEN_LIBRARY_COVER_URL: str = "https://covers.openlibrary.org/b/id/{}-M.jpg"
+    OPEN_LIBRARY_USER_AGENT: str = "ReadingListAPI/1.0"
+
+    # Open Library connection pool
+    OPEN_LIBRARY_MAX_CONNECTIONS: int = 100
+    OPEN_LIBRARY_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPEN_LIBRARY_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    OPEN_LIBRARY_HTTP2: bool = True
+    
+    # Open Library timeouts (seconds); read timeouts are per endpoint
+    OPEN_LIBRARY_CONNECT_TIMEOUT: float = 3.0
+    OPEN_LIBRARY_READ_TIMEOUTS: Dict[str, float] = {
+        "search": 8.0,
+        "work": 5.0,
+        "author": 3.0,
+    }
+    OPEN_LIBRARY_DEFAULT_READ_TIMEOUT: float = 5.0
+    
+    # Retries with jittered exponential backoff, capped at a share of the
+    # requests in the last OPEN_LIBRARY_RETRY_BUDGET_WINDOW seconds
+    OPEN_LIBRARY_MAX_RETRIES: int = 2
+    OPEN_LIBRARY_RETRY_BASE_DELAY: float = 0.2
+    OPEN_LIBRARY_RETRY_MAX_DELAY: float = 2.0
+    OPEN_LIBRARY_RETRY_BUDGET_RATIO: float = 0.2
+    OPEN_LIBRARY_RETRY_BUDGET_MIN: int = 10
+    OPEN_LIBRARY_RETRY_BUDGET_WINDOW: float = 10.0
+    
+    # Outbound limits shared by every Open Library request; waiting
+    # requests are served interactive first, background last
+    OPEN_LIBRARY_MAX_CONCURRENCY: int = 50
+    OPEN_LIBRARY_RATE_LIMIT: float = 20.0  # requests per second, 0 disables
+    OPEN_LIBRARY_RATE_BURST: int = 40
+    OPEN_LIBRARY_QUEUE_TIMEOUT: float = 10.0  # seconds a request may wait for a slot
+    
+    # Circuit breaker around the Open Library client
+    OPEN_LIBRARY_BREAKER_WINDOW: float = 30.0  # seconds of call history
+    OPEN_LIBRARY_BREAKER_MIN_CALLS: int = 20
+    OPEN_LIBRARY_BREAKER_ERROR_THRESHOLD: float = 0.5
+    OPEN_LIBRARY_BREAKER_SLOW_CALL_SECONDS: float = 3.0
+    OPEN_LIBRARY_BREAKER_SLOW_CALL_THRESHOLD: float = 0.8
+    OPEN_LIBRARY_BREAKER_OPEN_SECONDS: float = 30.0
+    OPEN_LIBRARY_BREAKER_HALF_OPEN_CALLS: int = 3
+
+    # Open Library response caching
+    CACHE_BACKEND: str = "tiered"  # "memory" or "tiered" (memory + SQLite)
+    CACHE_DIR: str = "cache"
+    CACHE_DB_FILE: str = "openlibrary_cache.sqlite3"
+    # The *_CACHE_MAX_SIZE settings bound the memory tier only; the SQLite
+    # tier keeps at most this many rows per cache, trimmed (soonest to
+    # expire first) when expired rows are purged
+    CACHE_L2_MAX_ROWS: int = 100000
+    SEARCH_CACHE_TTL: int = 300  # seconds
+    SEARCH_CACHE_MAX_SIZE: int = 5000
+    WORK_CACHE_TTL: int = 60 * 60  # 1 hour
+    WORK_CACHE_MAX_SIZE: int = 5000
+    # Expired search/work entries are kept this long so they can be
+    # revalidated upstream with their ETag/Last-Modified
+    SEARCH_CACHE_STALE_TTL: int = 60 * 60  # 1 hour
+    WORK_CACHE_STALE_TTL: int = 60 * 60 * 24  # 1 day
+    # Per-endpoint stale serving windows, in seconds past expiry: within
+    # stale-while-revalidate the expired entry is returned at once and
+    # refreshed in the background; within stale-if-error it is returned
+    # when Open Library fails
+    SEARCH_STALE_WHILE_REVALIDATE: int = 60
+    SEARCH_STALE_IF_ERROR: int = 60 * 60  # 1 hour
+    BOOK_DETAILS_STALE_WHILE_REVALIDATE: int = 60 * 10  # 10 minutes
+    BOOK_DETAILS_STALE_IF_ERROR: int = 60 * 60 * 24  # 1 day
+    AUTHOR_CACHE_TTL: int = 60 * 60 * 24  # 1 day
+    AUTHOR_CACHE_MAX_SIZE: int = 20000
+    
+    # Cache-Control sent with book details; responses are revalidated with
+    # ETag/Last-Modified once max-age runs out
+    BOOK_DETAILS_CACHE_CONTROL: str = "public, max-age=300"
+
+    # Reading list
+    READING_LIST_BATCH_MAX_ITEMS: int = 500
+
+    # Local Open Library catalog (works/authors imported from dumps)
+    LOCAL_CATALOG_ENABLED: bool = True
+    LOCAL_CATALOG_TIMEOUT: float = 0.5  # seconds before a lookup falls back upstream
+
+    # Local search index
+    SEARCH_INDEX_MAX_DOCS: int = 200000
 
     @validator("DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
@@ -44,6 +155,17 @@ class Settings(BaseSettings):
     # Logging settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("LOG_FILE", "app.log")
+    LOG_QUEUE_SIZE: int = 10000  # records buffered for the background writer
+    LOG_QUEUE_OVERFLOW: str = "drop_new"  # or "drop_oldest"
+    # Per-logger sampling: keep 1 in N records below WARNING
+    LOG_SAMPLE_RATES: Dict[str, int] = {
+        "app.api.endpoints.books": 10,
+    }
+    # Per-logger cap on records per second below WARNING
+    LOG_RATE_LIMITS: Dict[str, float] = {
+        "app.api.endpoints.books": 50,
+        "app.api.endpoints.auth": 20,
+    }
 
     class Config:
         case_sensitive = True
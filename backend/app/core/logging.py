@@ -1,17 +1,55 @@
 import os
+import sys
+import copy
+import queue
+import atexit
+import itertools
 import logging
+import threading
 import json
-from datetime import datetime
+import time
 import logging.config
+import logging.handlers
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib encoder
+    orjson = None
 
 
 class JSONFormatter(logging.Formatter):
-    """JSON log formatter that outputs logs in a structured JSON format"""
-    
+    """
+    JSON log formatter that outputs logs in a structured JSON format.
+
+    Uses orjson when it is installed. Fields that are the same for every
+    record (static_fields) are serialized once up front, the timestamp
+    prefix is reused within the same second, and exception text is only
+    rendered once per record.
+    """
+
+    def __init__(self, static_fields: Optional[Dict[str, Any]] = None, use_orjson: bool = True):
+        super().__init__()
+        self.static_fields = dict(static_fields or {})
+        self._orjson = orjson if use_orjson else None
+        self._encode = json.JSONEncoder(default=str).encode
+        # '"key": value, ' fragment spliced into every record by the json path
+        static_json = self._encode(self.static_fields)[1:-1]
+        self._static_json = static_json + ", " if static_json else ""
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._cached_prefix}.{int((created - second) * 1000000):06d}"
+
     def format(self, record):
         log_record = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module,
@@ -23,14 +61,169 @@ class JSONFormatter(logging.Formatter):
             log_record.update(record.props)
             
         if record.exc_info:
-            log_record["exception"] = self.formatException(record.exc_info)
-            
-        return json.dumps(log_record)
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_record["exception"] = record.exc_text
+        
+        if self._orjson is not None:
+            if self.static_fields:
+                log_record = {**self.static_fields, **log_record}
+            return self._orjson.dumps(log_record, default=str).decode()
+        return "{" + self._static_json + self._encode(log_record)[1:]
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a bounded queue that never blocks the caller.
+
+    When the queue is full the record is dropped ("drop_new") or the
+    oldest queued record is discarded to make room ("drop_oldest").
+    Dropped records are counted so the loss is visible.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop_new"):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Records stay in-process, so keep exc_info for the formatters and
+        # only merge the args into the message
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Logger filter that thins out high-volume records.
+
+    Records at always_level (WARNING) and above always pass. Below that,
+    only 1 in sample_rate records is kept and at most max_per_second of
+    those are let through each second. Suppressed records are counted.
+    """
+
+    def __init__(self, sample_rate: int = 1, max_per_second: Optional[float] = None, always_level: int = logging.WARNING):
+        super().__init__()
+        self.sample_rate = max(1, sample_rate)
+        self.max_per_second = max_per_second
+        self.always_level = always_level
+        self.passed = 0
+        self.sampled_out = 0
+        self.rate_limited = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._window = 0
+        self._window_count = 0
+
+    def filter(self, record):
+        if record.levelno >= self.always_level:
+            return True
+
+        with self._lock:
+            if next(self._counter) % self.sample_rate:
+                self.sampled_out += 1
+                return False
+
+            if self.max_per_second is not None:
+                window = int(record.created)
+                if window != self._window:
+                    self._window = window
+                    self._window_count = 0
+                if self._window_count >= self.max_per_second:
+                    self.rate_limited += 1
+                    return False
+                self._window_count += 1
+
+            self.passed += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "max_per_second": self.max_per_second,
+            "passed": self.passed,
+            "sampled_out": self.sampled_out,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a full bounded queue"""
+
+    def enqueue_sentinel(self):
+        # The listener thread keeps draining, so this cannot block for long
+        self.queue.put(self._sentinel)
+
+
+# Background pipeline state, set by setup_logging
+_queue_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_sampling_filters: Dict[str, SamplingFilter] = {}
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Queue depth and dropped-record counters for the logging pipeline"""
+    if _queue_handler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "queued": _queue_handler.queue.qsize(),
+        "capacity": _queue_handler.queue.maxsize,
+        "overflow": _queue_handler.overflow,
+        "dropped": _queue_handler.dropped,
+        "sampling": {name: log_filter.stats() for name, log_filter in _sampling_filters.items()},
+    }
+
+
+def stop_logging():
+    """Flush the queue and stop the background listener"""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+
+    dropped = _queue_handler.dropped if _queue_handler is not None else 0
+    if dropped:
+        # The listener no longer drains the queue, so write straight to its handlers
+        record = logging.getLogger(__name__).makeRecord(
+            __name__, logging.WARNING, __file__, 0,
+            "%s log records were dropped because the queue was full", (dropped,), None, "stop_logging",
+        )
+        for handler in listener.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
 
 
 def setup_logging():
-    """Configure application logging"""
+    """
+    Configure application logging.
+
+    Loggers only put records on a bounded in-memory queue; a background
+    QueueListener thread does the console and file I/O, so logging never
+    blocks the event loop.
+    """
     from app.core.config import settings
+    global _queue_handler, _listener
+    
+    stop_logging()
     
     # Create logs directory if it doesn't exist
     logs_dir = Path("logs")
@@ -38,50 +231,64 @@ def setup_logging():
     
     log_file = logs_dir / settings.LOG_FILE
     
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(settings.LOG_LEVEL)
+    console_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=10485760,  # 10 MB
+        backupCount=5,
+        encoding="utf8",
+    )
+    file_handler.setLevel(settings.LOG_LEVEL)
+    file_handler.setFormatter(JSONFormatter(static_fields={"service": settings.PROJECT_NAME}))
+    
+    _queue_handler = DroppingQueueHandler(
+        queue.Queue(maxsize=settings.LOG_QUEUE_SIZE),
+        overflow=settings.LOG_QUEUE_OVERFLOW,
+    )
+    _listener = DrainingQueueListener(
+        _queue_handler.queue, console_handler, file_handler, respect_handler_level=True
+    )
+    
     logging_config = {
         "version": 1,
         "disable_existing_loggers": False,
-        "formatters": {
-            "json": {
-                "()": JSONFormatter,
-            },
-            "standard": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            },
-        },
         "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "standard",
-                "stream": "ext://sys.stdout",
-            },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "json",
-                "filename": log_file,
-                "maxBytes": 10485760,  # 10 MB
-                "backupCount": 5,
-                "encoding": "utf8",
+            "queue": {
+                "()": lambda: _queue_handler,
             },
         },
         "loggers": {
             "": {  # Root logger
-                "handlers": ["console", "file"],
+                "handlers": ["queue"],
                 "level": settings.LOG_LEVEL,
             },
             "uvicorn": {
-                "handlers": ["console", "file"],
+                "handlers": ["queue"],
                 "level": settings.LOG_LEVEL,
                 "propagate": False,
             },
             "uvicorn.access": {
-                "handlers": ["console", "file"],
+                "handlers": ["queue"],
                 "level": settings.LOG_LEVEL,
                 "propagate": False,
             },
         },
     }
     
-    logging.config.dictConfig(logging_config) 
\ No newline at end of file
+    logging.config.dictConfig(logging_config)
+    
+    for name, log_filter in _sampling_filters.items():
+        logging.getLogger(name).removeFilter(log_filter)
+    _sampling_filters.clear()
+    for name in set(settings.LOG_SAMPLE_RATES) | set(settings.LOG_RATE_LIMITS):
+        log_filter = SamplingFilter(
+            sample_rate=settings.LOG_SAMPLE_RATES.get(name, 1),
+            max_per_second=settings.LOG_RATE_LIMITS.get(name),
+        )
+        logging.getLogger(name).addFilter(log_filter)
+        _sampling_filters[name] = log_filter
+    _listener.start()
+    atexit.register(stop_logging)
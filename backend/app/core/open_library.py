@@ -0,0 +1,237 @@
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+import httpx
+
+from app.core.circuit_breaker import CircuitBreaker, RetryBudget
+from app.core.config import settings
+from app.core.rate_limiter import DEFAULT, PriorityLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of calling Open Library while the circuit breaker is open"""
+
+
+class UpstreamBusyError(httpx.HTTPError):
+    """Raised when a request waited too long for an outbound slot"""
+
+class ConditionalResponse(NamedTuple):
+    """Result of a conditional GET; data is None when not_modified"""
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    not_modified: bool
+
+
+# Application-scoped client shared by every Open Library call
+_client: Optional[httpx.AsyncClient] = None
+
+breaker = CircuitBreaker(
+    "openlibrary",
+    window=settings.OPEN_LIBRARY_BREAKER_WINDOW,
+    min_calls=settings.OPEN_LIBRARY_BREAKER_MIN_CALLS,
+    error_threshold=settings.OPEN_LIBRARY_BREAKER_ERROR_THRESHOLD,
+    slow_call_seconds=settings.OPEN_LIBRARY_BREAKER_SLOW_CALL_SECONDS,
+    slow_call_threshold=settings.OPEN_LIBRARY_BREAKER_SLOW_CALL_THRESHOLD,
+    open_seconds=settings.OPEN_LIBRARY_BREAKER_OPEN_SECONDS,
+    half_open_calls=settings.OPEN_LIBRARY_BREAKER_HALF_OPEN_CALLS,
+)
+
+limiter = PriorityLimiter(
+    max_concurrency=settings.OPEN_LIBRARY_MAX_CONCURRENCY,
+    rate=settings.OPEN_LIBRARY_RATE_LIMIT,
+    burst=settings.OPEN_LIBRARY_RATE_BURST,
+)
+
+# Priority class of the requests made from the current task; tasks
+# started from it (e.g. single-flight fetches) inherit it
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("open_library_priority", default=DEFAULT)
+
+retry_budget = RetryBudget(
+    ratio=settings.OPEN_LIBRARY_RETRY_BUDGET_RATIO,
+    min_retries=settings.OPEN_LIBRARY_RETRY_BUDGET_MIN,
+    window=settings.OPEN_LIBRARY_RETRY_BUDGET_WINDOW,
+)
+
+
+def create_client() -> httpx.AsyncClient:
+    """Build an AsyncClient with a pooled, keep-alive connection setup"""
+    limits = httpx.Limits(
+        max_connections=settings.OPEN_LIBRARY_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPEN_LIBRARY_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.OPEN_LIBRARY_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=settings.OPEN_LIBRARY_HTTP2,
+        timeout=endpoint_timeout(None),
+        headers={"User-Agent": settings.OPEN_LIBRARY_USER_AGENT},
+    )
+
+
+async def startup() -> None:
+    """Open the shared client (called from the app startup event)"""
+    global _client
+    if _client is None:
+        _client = create_client()
+        logger.info("Open Library client started")
+
+
+async def shutdown() -> None:
+    """Close the shared client and release pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Open Library client closed")
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it lazily if the app
+    was started without the startup hook (e.g. in scripts)
+    """
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Run Open Library requests made in this block at the given priority class"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def endpoint_timeout(endpoint: Optional[str]) -> httpx.Timeout:
+    read = settings.OPEN_LIBRARY_READ_TIMEOUTS.get(endpoint, settings.OPEN_LIBRARY_DEFAULT_READ_TIMEOUT)
+    return httpx.Timeout(read, connect=settings.OPEN_LIBRARY_CONNECT_TIMEOUT)
+
+
+def _retryable(response: httpx.Response) -> bool:
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff"""
+    cap = min(settings.OPEN_LIBRARY_RETRY_MAX_DELAY, settings.OPEN_LIBRARY_RETRY_BASE_DELAY * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+async def request(
+    endpoint: Optional[str],
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.Response:
+    """
+    GET through the shared client behind the outbound limiter and the
+    circuit breaker.
+
+    Each attempt waits for a limiter slot at the current priority class
+    and raises UpstreamBusyError if none frees up in time. Transport errors, 5xx and 429 count as failures and are retried with
+    jittered backoff while the retry budget allows. Raises CircuitOpenError
+    without touching the network while the breaker is open.
+    """
+    timeout = endpoint_timeout(endpoint)
+    retry_budget.record_request()
+    attempt = 0
+    while True:
+        # Checked before queueing so an open breaker fails fast without
+        # taking a rate token or waiting for a slot
+        if not breaker.allow():
+            raise CircuitOpenError(f"Open Library circuit breaker is open, not requesting {url}")
+
+        try:
+            await limiter.acquire(_priority.get(), timeout=settings.OPEN_LIBRARY_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            breaker.cancel()
+            raise UpstreamBusyError(f"Timed out waiting for an Open Library request slot for {url}")
+        except BaseException:
+            breaker.cancel()
+            raise
+
+        try:
+            started = time.monotonic()
+            try:
+                response = await get_client().get(url, params=params, headers=headers, timeout=timeout)
+            except httpx.TransportError as e:
+                breaker.record(False, time.monotonic() - started)
+                error: Optional[httpx.TransportError] = e
+            except BaseException:
+                breaker.cancel()
+                raise
+            else:
+                failed = _retryable(response)
+                breaker.record(not failed, time.monotonic() - started)
+                if not failed:
+                    return response
+                error = None
+        finally:
+            limiter.release()
+
+        if attempt >= settings.OPEN_LIBRARY_MAX_RETRIES or not retry_budget.try_spend():
+            if error is not None:
+                raise error
+            return response
+
+        attempt += 1
+        delay = _backoff(attempt)
+        logger.info("Retrying %s in %.2fs (attempt %s)", url, delay, attempt)
+        await asyncio.sleep(delay)
+
+
+def stats() -> Dict[str, Any]:
+    return {"breaker": breaker.stats(), "retries": retry_budget.stats(), "limiter": limiter.stats()}
+
+
+async def get_json(url: str, params: Optional[Dict[str, Any]] = None, endpoint: Optional[str] = None) -> Any:
+    """GET an Open Library URL through the shared client and decode the JSON body"""
+    response = await request(endpoint, url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_json_conditional(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    endpoint: Optional[str] = None,
+) -> ConditionalResponse:
+    """
+    GET an Open Library URL, revalidating with the validators of a copy
+    we already hold. A 304 comes back as not_modified without a body.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = await request(endpoint, url, params=params, headers=headers)
+    if response.status_code == 304 and headers:
+        return ConditionalResponse(
+            None,
+            response.headers.get("etag", etag),
+            response.headers.get("last-modified", last_modified),
+            True,
+        )
+    response.raise_for_status()
+    return ConditionalResponse(
+        response.json(),
+        response.headers.get("etag"),
+        response.headers.get("last-modified"),
+        False,
+    )
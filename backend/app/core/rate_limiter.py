@@ -0,0 +1,121 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.wait_stats import WaitStats
+
+# Priority classes, lowest value served first
+INTERACTIVE = 0
+DEFAULT = 1
+BACKGROUND = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", DEFAULT: "default", BACKGROUND: "background"}
+
+
+class PriorityLimiter:
+    """
+    Async concurrency limit combined with a token-bucket rate limit.
+
+    A caller needs a free slot (at most max_concurrency in flight) and a
+    token (refilled at rate per second, up to burst) to proceed. Callers
+    that have to wait are served by priority class, then first come first
+    served, so interactive requests overtake queued background work.
+    A rate of 0 disables the token bucket.
+
+    Waiters are futures on the running loop and the refill timer is a
+    loop callback, so every caller must share one event loop.
+    """
+
+    def __init__(self, max_concurrency: int, rate: float = 0, burst: int = 1):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, "asyncio.Future"]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stats = {priority: WaitStats() for priority in PRIORITY_NAMES}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _try_take(self) -> bool:
+        if self._in_flight >= self.max_concurrency:
+            return False
+        if self.rate > 0:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+        self._in_flight += 1
+        return True
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the highest-priority waiters"""
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                # Out of tokens rather than slots: wake up when the next one is due
+                if self.rate > 0 and self._in_flight < self.max_concurrency and self._timer is None:
+                    delay = (1 - self._tokens) / self.rate
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+    async def acquire(self, priority: int = DEFAULT, timeout: Optional[float] = None) -> None:
+        """
+        Wait for a slot and a token. Raises asyncio.TimeoutError if none
+        is granted within timeout seconds; the slot must be released
+        with release() otherwise.
+        """
+        stats = self._stats.get(priority, self._stats[DEFAULT])
+        started = time.monotonic()
+        if not self._waiters and self._try_take():
+            stats.record(0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller gave up
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+        stats.record(time.monotonic() - started)
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "queued": sum(1 for _, _, future in self._waiters if not future.done()),
+            "max_concurrency": self.max_concurrency,
+            "rate": self.rate,
+            "burst": self.burst,
+            "wait": {PRIORITY_NAMES[priority]: stats.as_dict() for priority, stats in self._stats.items()},
+        }
@@ -0,0 +1,198 @@
+import bisect
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Search types accepted by the books endpoints mapped to indexed fields
+FIELD_MAP = {
+    "title": ("title",),
+    "author": ("author",),
+    "isbn": ("isbn",),
+    "q": ("title", "author", "isbn"),
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def normalize_isbn(isbn: str) -> str:
+    return re.sub(r"[^0-9xX]", "", isbn).lower()
+
+
+class _FieldIndex:
+    """Inverted index for one field with a sorted vocabulary for prefix lookups"""
+
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = {}
+        self.vocabulary: List[str] = []
+
+    def add(self, token: str, doc_key: str) -> None:
+        keys = self.postings.get(token)
+        if keys is None:
+            keys = self.postings[token] = set()
+            bisect.insort(self.vocabulary, token)
+        keys.add(doc_key)
+
+    def remove(self, token: str, doc_key: str) -> None:
+        keys = self.postings.get(token)
+        if keys is None:
+            return
+        keys.discard(doc_key)
+        if not keys:
+            del self.postings[token]
+            index = bisect.bisect_left(self.vocabulary, token)
+            del self.vocabulary[index]
+
+    def exact(self, token: str) -> Set[str]:
+        return self.postings.get(token, set())
+
+    def prefix(self, token: str) -> Set[str]:
+        matches: Set[str] = set()
+        start = bisect.bisect_left(self.vocabulary, token)
+        for vocab_token in self.vocabulary[start:]:
+            if not vocab_token.startswith(token):
+                break
+            matches |= self.postings[vocab_token]
+        return matches
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over titles, author names and ISBNs of books
+    we have seen, either from Open Library responses or reading lists.
+
+    Documents use the same shape as Open Library search docs (key, title,
+    author_name, first_publish_year, cover_i, isbn) so local results can be
+    returned from the search endpoint unchanged. Every query token must
+    match; the last one also matches as a prefix for autocomplete.
+    """
+
+    def __init__(self, max_docs: int):
+        self.max_docs = max_docs
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._fields = {field: _FieldIndex() for field in ("title", "author", "isbn")}
+        self._doc_tokens: Dict[str, List[Tuple[str, str]]] = {}
+        self._full_warned = False
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @staticmethod
+    def _doc_tokens_for(doc: Dict[str, Any]) -> List[Tuple[str, str]]:
+        tokens = {("title", token) for token in tokenize(doc.get("title") or "")}
+        for name in doc.get("author_name") or []:
+            tokens.update(("author", token) for token in tokenize(name))
+        for isbn in doc.get("isbn") or []:
+            normalized = normalize_isbn(isbn)
+            if normalized:
+                tokens.add(("isbn", normalized))
+        return list(tokens)
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        """Index a search-style doc, merging with what we already know about it"""
+        key = doc.get("key")
+        if not key or not doc.get("title"):
+            return
+
+        existing = self.docs.get(key)
+        if existing is None and len(self.docs) >= self.max_docs:
+            if not self._full_warned:
+                logger.warning("Search index is full (%s docs), not indexing new books", self.max_docs)
+                self._full_warned = True
+            return
+
+        if existing is not None:
+            # Newer values win; the existing doc only fills fields the new one lacks
+            merged = dict(existing)
+            merged.update({field: value for field, value in doc.items() if value})
+            self.remove(key)
+            doc = merged
+
+        self.docs[key] = doc
+        tokens = self._doc_tokens_for(doc)
+        self._doc_tokens[key] = tokens
+        for field, token in tokens:
+            self._fields[field].add(token, key)
+
+    def add_many(self, docs: Iterable[Dict[str, Any]]) -> None:
+        for doc in docs:
+            self.add(doc)
+
+    def remove(self, key: str) -> None:
+        for field, token in self._doc_tokens.pop(key, []):
+            self._fields[field].remove(token, key)
+        self.docs.pop(key, None)
+
+    def _match(self, fields: Tuple[str, ...], token: str, prefix: bool) -> Set[str]:
+        matches: Set[str] = set()
+        for field in fields:
+            index = self._fields[field]
+            matches |= index.prefix(token) if prefix else index.exact(token)
+        return matches
+
+    def search(self, query: str, search_type: str = "q", limit: int = 10, offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (total matches, page of docs) for a query"""
+        fields = FIELD_MAP.get(search_type, FIELD_MAP["q"])
+        if fields == ("isbn",):
+            tokens = [normalize_isbn(query)]
+        else:
+            tokens = tokenize(query)
+        tokens = [token for token in tokens if token]
+        if not tokens:
+            return 0, []
+
+        result: Optional[Set[str]] = None
+        for position, token in enumerate(tokens):
+            is_last = position == len(tokens) - 1
+            matches = self._match(fields, token, prefix=is_last)
+            result = matches if result is None else result & matches
+            if not result:
+                return 0, []
+
+        # Rank exact hits on the final token ahead of prefix-only hits
+        exact_last = self._match(fields, tokens[-1], prefix=False)
+        ranked = sorted(
+            result,
+            key=lambda key: (key not in exact_last, (self.docs[key].get("title") or "").lower()),
+        )
+        return len(ranked), [self.docs[key] for key in ranked[offset:offset + limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "docs": len(self.docs),
+            "max_docs": self.max_docs,
+            "tokens": {field: len(index.postings) for field, index in self._fields.items()},
+        }
+
+
+def reading_list_item_doc(item: Any) -> Dict[str, Any]:
+    """Convert a ReadingListItem into a search-style doc"""
+    book_id = item.book_id if item.book_id.startswith("/works/") else f"/works/{item.book_id}"
+    return {
+        "key": book_id,
+        "title": item.title,
+        "author_name": [item.author] if item.author else [],
+        "first_publish_year": getattr(item, "year", None),
+        "cover_i": item.cover_id,
+        "isbn": [],
+    }
+
+
+async def index_reading_lists(db: Any) -> None:
+    """Index every book that sits in a user's reading list"""
+    from sqlmodel import select
+    from app.models.reading_list import ReadingListItem
+
+    items = await db.stream_scalars(select(ReadingListItem).execution_options(yield_per=1000))
+    async for item in items:
+        search_index.add(reading_list_item_doc(item))
+
+
+search_index = SearchIndex(max_docs=settings.SEARCH_INDEX_MAX_DOCS)
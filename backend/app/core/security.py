@@ -1,14 +1,23 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.database import db_state, get_async_db
 from app.models.user import User
 from app.schemas.user import TokenData
 
@@ -16,6 +25,27 @@ from app.schemas.user import TokenData
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Short-lived cache of authenticated users keyed by id. Entries are dropped
+# as soon as this process updates or deletes the user; the TTL bounds how
+# long other workers may see a stale copy.
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# Verified tokens keyed by SHA-256 digest, so the signature of a token is
+# checked once rather than on every request. Entries never outlive `exp`.
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
+
+def invalidate_cached_user(user_id: Optional[int]) -> None:
+    """Drop a user from the principal cache"""
+    if user_id is not None:
+        user_cache.delete(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target) -> None:
+    invalidate_cached_user(target.id)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
@@ -27,6 +57,58 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# bcrypt releases the GIL, so a small dedicated thread pool runs hashes in
+# parallel without competing with the request threadpool
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+
+class AccountConcurrencyLimiter:
+    """Reject password checks beyond a fixed number in flight per account"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.rejected = 0
+        self._active: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def acquire(self, account: str) -> AsyncIterator[None]:
+        account = account.lower()
+        if self._active.get(account, 0) >= self.limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent login attempts for this account",
+            )
+        self._active[account] = self._active.get(account, 0) + 1
+        try:
+            yield
+        finally:
+            self._active[account] -= 1
+            if not self._active[account]:
+                del self._active[account]
+
+
+login_limiter = AccountConcurrencyLimiter(settings.PASSWORD_CHECKS_PER_ACCOUNT)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate a password hash on the password executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str, account: str) -> bool:
+    """
+    Verify a password on the password executor, allowing only a limited
+    number of concurrent checks per account
+    """
+    async with login_limiter.acquire(account):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a new JWT access token
@@ -48,6 +130,11 @@ def verify_token(token: str, credentials_exception):
     """
     Verify the JWT token and return token data
     """
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    token_data = token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
@@ -57,13 +144,20 @@ def verify_token(token: str, credentials_exception):
             raise credentials_exception
             
         token_data = TokenData(username=username, user_id=user_id)
-        return token_data
         
     except JWTError:
         raise credentials_exception
+    
+    ttl = settings.TOKEN_CACHE_TTL
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(digest, token_data, ttl=ttl)
+    
+    return token_data
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """
     Get the current user based on the JWT token
     """
@@ -74,15 +168,33 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     )
     
     token_data = verify_token(token, credentials_exception)
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    
+    user = user_cache.get(token_data.user_id)
+    if user is not None:
+        return user
+    
+    # Users not cached yet need the database; while it is unreachable the
+    # request is answered with 503 rather than failing with a 500
+    database_unavailable = HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Database unavailable, please retry shortly",
+        headers={"Retry-After": "5"},
+    )
+    if not db_state.ready:
+        raise database_unavailable
+    try:
+        user = (await db.exec(select(User).where(User.id == token_data.user_id))).first()
+    except SQLAlchemyError:
+        raise database_unavailable
     
     if user is None:
         raise credentials_exception
-        
+    
+    user_cache.set(user.id, user)
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """
     Check if the current user is active
     """
@@ -0,0 +1,29 @@
+from typing import Any, Dict
+
+
+class WaitStats:
+    """
+    Counters for how long callers wait for a shared resource (a pooled
+    connection, a limiter slot). count_key names the grant counter in
+    as_dict(), e.g. "checkouts" for a connection pool.
+    """
+
+    def __init__(self, count_key: str = "acquired"):
+        self.count_key = count_key
+        self.count = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.count += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            self.count_key: self.count,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": self.total_wait / self.count * 1000 if self.count else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -0,0 +1,130 @@
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog import Author, Work
+
+logger = logging.getLogger(__name__)
+
+# Dump record types and the table each one is imported into
+RECORD_TYPES = {
+    "/type/work": Work.__table__,
+    "/type/author": Author.__table__,
+}
+
+
+def iter_dump(path: Path) -> Iterator[Tuple[str, str, Optional[int], str, Dict[str, Any]]]:
+    """
+    Stream an Open Library dump line by line.
+
+    Dumps are tab-separated: type, key, revision, last_modified, JSON.
+    Gzipped files are decompressed on the fly so memory stays constant.
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as dump:
+        for line_number, line in enumerate(dump, 1):
+            parts = line.rstrip("\n").split("\t", 4)
+            if len(parts) != 5:
+                logger.warning("Skipping malformed dump line %s", line_number)
+                continue
+            record_type, key, revision, last_modified, raw = parts
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                logger.warning("Skipping dump line %s with invalid JSON", line_number)
+                continue
+            yield record_type, key, int(revision) if revision.isdigit() else None, last_modified, data
+
+
+def _row_for(record_type: str, key: str, revision: Optional[int], last_modified: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    short_key = key.split("/")[-1]
+    if record_type == "/type/work":
+        return {
+            "key": short_key,
+            "title": data.get("title") or "Unknown Title",
+            "revision": revision,
+            "last_modified": last_modified,
+            "data": json.dumps(data),
+        }
+    if record_type == "/type/author":
+        return {
+            "key": short_key,
+            "name": data.get("name") or data.get("personal_name") or short_key,
+            "revision": revision,
+            "last_modified": last_modified,
+        }
+    return None
+
+
+def _upsert(conn: Connection, table, rows: List[Dict[str, Any]]) -> None:
+    """Write one multi-row statement, replacing rows we imported earlier"""
+    dialect = conn.dialect.name
+    columns = [column for column in rows[0] if column != "key"]
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in columns})
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={column: stmt.excluded[column] for column in columns},
+        )
+    else:
+        stmt = table.insert().values(rows)
+    conn.execute(stmt)
+
+
+def import_dump(engine: Engine, path: Path, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Import works and authors from a dump into the local catalog using
+    batched multi-row upserts. Returns the number of rows per record type.
+    """
+    counts = {record_type: 0 for record_type in RECORD_TYPES}
+    batches: Dict[str, List[Dict[str, Any]]] = {record_type: [] for record_type in RECORD_TYPES}
+
+    def flush(record_type: str) -> None:
+        batch = batches[record_type]
+        if not batch:
+            return
+        with engine.begin() as conn:
+            _upsert(conn, RECORD_TYPES[record_type], batch)
+        counts[record_type] += len(batch)
+        batch.clear()
+
+    for record in iter_dump(path):
+        record_type = record[0]
+        if record_type not in RECORD_TYPES:
+            continue
+        batches[record_type].append(_row_for(*record))
+        if len(batches[record_type]) >= batch_size:
+            flush(record_type)
+
+    for record_type in RECORD_TYPES:
+        flush(record_type)
+
+    logger.info("Imported %s works and %s authors from %s", counts["/type/work"], counts["/type/author"], path)
+    return counts
+
+
+async def get_work_payload(db: AsyncSession, work_key: str) -> Optional[Dict[str, Any]]:
+    """Return the raw Open Library JSON for an imported work, if we have it"""
+    data = (await db.execute(select(Work.data).where(Work.key == work_key))).scalar()
+    return json.loads(data) if data is not None else None
+
+
+async def get_author_names(db: AsyncSession, author_keys: Iterable[str]) -> Dict[str, str]:
+    """Return names for the imported authors among author_keys"""
+    author_keys = list(author_keys)
+    if not author_keys:
+        return {}
+    rows = await db.execute(select(Author.key, Author.name).where(Author.key.in_(author_keys)))
+    return {key: name for key, name in rows}
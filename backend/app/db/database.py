@@ -1,39 +1,160 @@
+import asyncio
 import logging
 import time
-from sqlalchemy.exc import OperationalError
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.wait_stats import WaitStats
 
 logger = logging.getLogger(__name__)
 
+
+def timed_pool_class(base, stats: WaitStats):
+    """Subclass a queue pool so every checkout records its wait time"""
+
+    class TimedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                stats.timeouts += 1
+                raise
+            stats.record(time.perf_counter() - start)
+            return connection
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+def pool_options(url: str, base, stats: WaitStats) -> Dict[str, Any]:
+    """Engine pool arguments taken from Settings"""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    # SQLite (used for local testing) manages its own pool
+    if not url.startswith("sqlite"):
+        options.update(
+            poolclass=timed_pool_class(base, stats),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+sync_pool_stats = WaitStats("checkouts")
+async_pool_stats = WaitStats("checkouts")
+
 # Create SQLAlchemy engine
 SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    **pool_options(SQLALCHEMY_DATABASE_URL, QueuePool, sync_pool_stats),
+)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def create_db_and_tables():
-    """Create the database tables from SQLModel models"""
-    max_retries = 10
-    retry_delay = 5
-    for i in range(max_retries):
+# Async engine used by the request handlers, so DB-bound requests don't tie up worker threads
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.ASYNC_DATABASE_URI or \
+    f"mysql+aiomysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    **pool_options(ASYNC_SQLALCHEMY_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_stats),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+def _pool_status(pool, stats: WaitStats) -> Dict[str, Any]:
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    status.update(stats.as_dict())
+    return status
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Live checkout, overflow and wait-time statistics for both engines"""
+    return {
+        "sync": _pool_status(engine.pool, sync_pool_stats),
+        "async": _pool_status(async_engine.sync_engine.pool, async_pool_stats),
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        },
+    }
+
+class DatabaseState:
+    """Tracks whether the startup readiness wait has seen the database"""
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+
+
+db_state = DatabaseState()
+
+
+async def ping_database(timeout: float) -> None:
+    """Run a trivial query, raising if the database is unreachable"""
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.wait_for(ping(), timeout)
+
+
+async def wait_for_database() -> None:
+    """
+    Wait for the database without blocking the event loop, retrying with
+    exponential backoff until it answers
+    """
+    delay = settings.DB_STARTUP_INITIAL_DELAY
+    while True:
+        db_state.attempts += 1
         try:
-            logger.info("Creating database tables if they don't exist")
-            SQLModel.metadata.create_all(engine)
-            logger.info("Database tables created successfully")
-            return
-        except OperationalError as e:
-            logger.error(f"Error creating database tables: {e}")
-            if i < max_retries - 1:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-            else:
-                logger.error("Failed to create database tables after multiple retries.")
-                raise
+            await ping_database(settings.DB_READINESS_TIMEOUT)
+        except (OSError, SQLAlchemyError, asyncio.TimeoutError) as e:
+            db_state.last_error = str(e) or type(e).__name__
+            logger.warning("Database not ready (attempt %s): %s", db_state.attempts, db_state.last_error)
+            logger.info("Retrying in %.1f seconds...", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.DB_STARTUP_MAX_DELAY)
+            continue
+
+        db_state.ready = True
+        db_state.last_error = None
+        logger.info("Database ready after %s attempt(s)", db_state.attempts)
+        return
+
+
+async def create_db_and_tables():
+    """Create the database tables from SQLModel models"""
+    logger.info("Creating database tables if they don't exist")
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    logger.info("Database tables created successfully")
 
 # Dependency
 def get_db():
@@ -41,4 +162,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Async dependency
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db 
\ No newline at end of file
@@ -0,0 +1,28 @@
+from typing import Optional
+from sqlalchemy import Column, Text
+from sqlalchemy.dialects import mysql
+from sqlmodel import Field, SQLModel
+
+# Open Library records can be far larger than MySQL's 64 KB TEXT
+LongText = Text().with_variant(mysql.MEDIUMTEXT(), "mysql")
+
+
+class Work(SQLModel, table=True):
+    """Open Library work imported from a data dump"""
+    __tablename__ = "works"
+
+    key: str = Field(primary_key=True)  # e.g. OL45883W
+    title: str = Field(sa_column=Column(Text, nullable=False))
+    revision: Optional[int] = Field(default=None)
+    last_modified: Optional[str] = Field(default=None)
+    data: str = Field(sa_column=Column(LongText, nullable=False))  # raw work JSON
+
+
+class Author(SQLModel, table=True):
+    """Open Library author imported from a data dump"""
+    __tablename__ = "authors"
+
+    key: str = Field(primary_key=True)  # e.g. OL23919A
+    name: str = Field(sa_column=Column(Text, nullable=False))
+    revision: Optional[int] = Field(default=None)
+    last_modified: Optional[str] = Field(default=None)
@@ -1,11 +1,18 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, SQLModel, Relationship
 
 
 class ReadingListItem(SQLModel, table=True):
     """Model for reading list items (books)"""
     __tablename__ = "reading_list_items"
+    __table_args__ = (
+        # A book can only be on a user's list once; also serves lookups by user_id
+        UniqueConstraint("user_id", "book_id", name="uq_reading_list_items_user_id_book_id"),
+        # Keyset pagination walks a user's list in (added_at, id) order
+        Index("ix_reading_list_items_user_id_added_at", "user_id", "added_at", "id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     book_id: str = Field(index=True)  # ID from Open Library
@@ -14,7 +14,7 @@ class ReadingListItemBase(BaseModel):
 
 # Create Reading List Item Schema
 class ReadingListItemCreate(ReadingListItemBase):
-    pass
+    author: str  # the column is NOT NULL
 
 
 # Reading List Item Response Schema
@@ -24,4 +24,43 @@ class ReadingListItemResponse(ReadingListItemBase):
     added_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+# Cursor-paginated Reading List Schema
+class ReadingListPage(BaseModel):
+    items: List[ReadingListItemResponse]
+    next_cursor: Optional[str] = None
+
+
+# Batch Add Schemas
+class ReadingListBatchCreate(BaseModel):
+    items: List[ReadingListItemCreate]
+
+
+class ReadingListBatchItemResult(BaseModel):
+    book_id: str
+    status: str  # "created" or "duplicate"
+    item: Optional[ReadingListItemResponse] = None
+
+
+class ReadingListBatchCreateResponse(BaseModel):
+    created: int
+    duplicates: int
+    results: List[ReadingListBatchItemResult]
+
+
+# Batch Remove Schemas
+class ReadingListBatchDelete(BaseModel):
+    ids: List[int]
+
+
+class ReadingListBatchDeleteResult(BaseModel):
+    id: int
+    status: str  # "deleted" or "not_found"
+
+
+class ReadingListBatchDeleteResponse(BaseModel):
+    deleted: int
+    not_found: int
+    results: List[ReadingListBatchDeleteResult]
@@ -0,0 +1,81 @@
+import json
+import logging
+import time
+from datetime import datetime
+
+from app.core.logging import JSONFormatter, orjson
+
+RECORDS = 100000
+
+
+class LegacyJSONFormatter(logging.Formatter):
+    """The formatter we used before, kept here as the baseline"""
+
+    def format(self, record):
+        log_record = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "service": "Reading List API",
+        }
+
+        if hasattr(record, "props"):
+            log_record.update(record.props)
+
+        if record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(log_record)
+
+
+def make_record(i):
+    return logging.LogRecord(
+        name="app.api.endpoints.books",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=42,
+        msg="User %s searching for %s by %s (%s)",
+        args=("alice", f"query {i}", "title", "remote"),
+        exc_info=None,
+        func="search_books",
+    )
+
+
+def bench_formatter(name, formatter, records):
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {len(records) / elapsed:>12,.0f} records/s")
+
+
+def bench_filtered(name, log_call):
+    """Cost of a call below the logger's level, i.e. a record that is never emitted"""
+    start = time.perf_counter()
+    for i in range(RECORDS):
+        log_call(i)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {RECORDS / elapsed:>12,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    records = [make_record(i) for i in range(RECORDS)]
+    static_fields = {"service": "Reading List API"}
+
+    print(f"Formatting {RECORDS} records")
+    bench_formatter("legacy (json, utcnow)", LegacyJSONFormatter(), records)
+    bench_formatter("JSONFormatter (json)", JSONFormatter(static_fields, use_orjson=False), records)
+    if orjson is not None:
+        bench_formatter("JSONFormatter (orjson)", JSONFormatter(static_fields), records)
+    else:
+        print("orjson is not installed, skipping")
+
+    print("\nFiltered log calls (level WARNING, logging INFO)")
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.WARNING)
+    params = {"title": "harry potter", "limit": 10, "offset": 0}
+    bench_filtered("f-string", lambda i: logger.info(f"Making request to Open Library: {params} {i}"))
+    bench_filtered("%-style arguments", lambda i: logger.info("Making request to Open Library: %s %s", params, i))
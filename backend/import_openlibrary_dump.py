@@ -0,0 +1,26 @@
+import argparse
+import logging
+
+from app.db.catalog import import_dump
+from app.db.database import engine
+
+logging.basicConfig(level=logging.INFO)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import an Open Library works/authors dump into the local catalog. "
+        "The catalog tables are created by migrations, so run `alembic upgrade head` first."
+    )
+    parser.add_argument("dumps", nargs="+", help="Dump files (.txt or .txt.gz)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per insert statement")
+    args = parser.parse_args()
+
+    for dump in args.dumps:
+        print(f"Importing {dump}")
+        counts = import_dump(engine, dump, batch_size=args.batch_size)
+        print(f"Imported {counts['/type/work']} works and {counts['/type/author']} authors")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,29 @@
+import asyncio
 import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.api.api import api_router
-from app.db.database import create_db_and_tables
+from app.core import open_library
+from app.core.logging import get_logging_stats, setup_logging, stop_logging
+from app.core.security import password_executor, token_cache, user_cache
+from app.core.search_index import index_reading_lists
+from app.api.endpoints.books import close_caches, warm_search_index
+from app.db.database import (
+    AsyncSessionLocal,
+    async_engine,
+    create_db_and_tables,
+    db_state,
+    get_pool_stats,
+    ping_database,
+    wait_for_database,
+)
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -34,11 +46,36 @@ if settings.BACKEND_CORS_ORIGINS:
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+async def prepare_database():
+    """Wait for the database in the background, then run DB-dependent startup work"""
+    await wait_for_database()
+    # Schema changes are applied by the separate `alembic upgrade head` step
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        await create_db_and_tables()
+    try:
+        async with AsyncSessionLocal() as db:
+            await index_reading_lists(db)
+    except Exception as e:
+        logger.error("Could not index reading lists: %s", e)
+
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     logger.info("Starting up Reading List API")
-    create_db_and_tables()
-    logger.info("Database tables created")
+    await open_library.startup()
+    warm_search_index()
+    # /health/* and requests from users already in the user cache are
+    # served while this runs; other authenticated requests get a 503
+    app.state.db_startup = asyncio.create_task(prepare_database())
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    logger.info("Shutting down Reading List API")
+    app.state.db_startup.cancel()
+    await open_library.shutdown()
+    close_caches()
+    await async_engine.dispose()
+    password_executor.shutdown(wait=False)
+    stop_logging()
 
 @app.get("/")
 def root():
@@ -46,4 +83,35 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/live")
+def liveness_check():
+    """The process is up and serving requests"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """The database is reachable, so every route can be served"""
+    if not db_state.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "database": "down", "attempts": db_state.attempts, "error": db_state.last_error},
+        )
+    try:
+        await ping_database(settings.DB_READINESS_TIMEOUT)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": "down", "error": str(e)})
+    return {"status": "ready", "database": "up"}
+
+@app.get("/health/db-pool")
+def db_pool_stats():
+    return get_pool_stats()
+
+@app.get("/health/auth-cache")
+def auth_cache_stats():
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+@app.get("/health/logging")
+def logging_stats():
+    return get_logging_stats()
@@ -0,0 +1,42 @@
+"""reading list unique constraint and keyset index
+
+MySQL 8 builds both indexes online (InnoDB in-place DDL), so this can be
+applied while the app is serving traffic.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Drop duplicates left by the old check-then-insert race, keeping the oldest row
+    op.execute(
+        "DELETE FROM reading_list_items WHERE id NOT IN ("
+        " SELECT id FROM ("
+        "  SELECT MIN(id) AS id FROM reading_list_items GROUP BY user_id, book_id"
+        " ) AS keep)"
+    )
+    with op.batch_alter_table("reading_list_items") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_reading_list_items_user_id_book_id", ["user_id", "book_id"]
+        )
+        batch_op.create_index(
+            "ix_reading_list_items_user_id_added_at", ["user_id", "added_at", "id"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("reading_list_items") as batch_op:
+        batch_op.drop_index("ix_reading_list_items_user_id_added_at")
+        batch_op.drop_constraint("uq_reading_list_items_user_id_book_id", type_="unique")
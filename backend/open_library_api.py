@@ -4,6 +4,8 @@ import httpx
 import logging
 from typing import Optional
 
+from app.core import open_library
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,6 +25,14 @@ app.add_middleware(
 OPEN_LIBRARY_SEARCH_URL = "https://openlibrary.org/search.json"
 OPEN_LIBRARY_BOOK_URL = "https://openlibrary.org/works/{}.json"
 
+@app.on_event("startup")
+async def on_startup():
+    await open_library.startup()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await open_library.shutdown()
+
 @app.get("/")
 def read_root():
     return {"message": "Open Library API service is running"}
@@ -67,19 +77,15 @@ async def search_books(
     logger.info(f"Making request to Open Library: {params}")
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(OPEN_LIBRARY_SEARCH_URL, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"Found {data.get('numFound', 0)} results")
-            
-            return {
-                "numFound": data.get("numFound", 0),
-                "docs": data.get("docs", []),
-                "page": page,
-                "limit": limit
-            }
+        data = await open_library.get_json(OPEN_LIBRARY_SEARCH_URL, params=params, endpoint="search")
+        logger.info(f"Found {data.get('numFound', 0)} results")
+        
+        return {
+            "numFound": data.get("numFound", 0),
+            "docs": data.get("docs", []),
+            "page": page,
+            "limit": limit
+        }
     except httpx.HTTPError as e:
         logger.error(f"HTTP error occurred: {e}")
         return {"error": str(e), "numFound": 0, "docs": [], "page": page, "limit": limit}
@@ -99,38 +105,34 @@ async def get_book_details(book_id: str):
     
     try:
         # Get book details
-        async with httpx.AsyncClient() as client:
-            url = OPEN_LIBRARY_BOOK_URL.format(clean_id)
-            logger.info(f"Making request to: {url}")
-            
-            response = await client.get(url)
-            response.raise_for_status()
-            
-            book_data = response.json()
-            
-            # Extract and format the data
-            book_details = {
-                "id": clean_id,
-                "title": book_data.get("title", "Unknown Title"),
-                "description": book_data.get("description", {}).get("value", "") if isinstance(book_data.get("description"), dict) else book_data.get("description", ""),
-                "subjects": book_data.get("subjects", []),
-                "created": book_data.get("created", {}).get("value", "") if isinstance(book_data.get("created"), dict) else "",
-                "last_modified": book_data.get("last_modified", {}).get("value", "") if isinstance(book_data.get("last_modified"), dict) else "",
-                "cover_id": book_data.get("covers", [None])[0] if book_data.get("covers") else None,
-            }
-            
-            # Get author details if available
-            authors = []
-            if "authors" in book_data and isinstance(book_data["authors"], list):
-                for author in book_data["authors"]:
-                    if "author" in author and "key" in author["author"]:
-                        # We could fetch author details, but for simplicity we'll just use the key
-                        author_key = author["author"]["key"].split("/")[-1]
-                        authors.append({"name": author_key})
-            
-            book_details["authors"] = authors
-            
-            return book_details
+        url = OPEN_LIBRARY_BOOK_URL.format(clean_id)
+        logger.info(f"Making request to: {url}")
+        
+        book_data = await open_library.get_json(url, endpoint="work")
+        
+        # Extract and format the data
+        book_details = {
+            "id": clean_id,
+            "title": book_data.get("title", "Unknown Title"),
+            "description": book_data.get("description", {}).get("value", "") if isinstance(book_data.get("description"), dict) else book_data.get("description", ""),
+            "subjects": book_data.get("subjects", []),
+            "created": book_data.get("created", {}).get("value", "") if isinstance(book_data.get("created"), dict) else "",
+            "last_modified": book_data.get("last_modified", {}).get("value", "") if isinstance(book_data.get("last_modified"), dict) else "",
+            "cover_id": book_data.get("covers", [None])[0] if book_data.get("covers") else None,
+        }
+        
+        # Get author details if available
+        authors = []
+        if "authors" in book_data and isinstance(book_data["authors"], list):
+            for author in book_data["authors"]:
+                if "author" in author and "key" in author["author"]:
+                    # We could fetch author details, but for simplicity we'll just use the key
+                    author_key = author["author"]["key"].split("/")[-1]
+                    authors.append({"name": author_key})
+        
+        book_details["authors"] = authors
+        
+        return book_details
     except httpx.HTTPError as e:
         logger.error(f"HTTP error occurred: {e}")
         return {"error": str(e)}
@@ -0,0 +1,39 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+# Keep the Open Library caches in memory so tests never touch cache/
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.catalog import Author, Work  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def sample_dump() -> Path:
+    return FIXTURES / "ol_dump_sample.txt.gz"
+
+
+@pytest.fixture
+def catalog_engine(tmp_path):
+    """SQLite engine with the works and authors tables"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    SQLModel.metadata.create_all(engine, tables=[Work.__table__, Author.__table__])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def catalog_async_session(catalog_engine):
+    """Async session factory over the catalog_engine database"""
+    engine = create_async_engine(catalog_engine.url.set(drivername="sqlite+aiosqlite"))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    engine.sync_engine.dispose()
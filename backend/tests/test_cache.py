@@ -0,0 +1,55 @@
+import asyncio
+import sqlite3
+
+from app.core.cache import SQLiteCache, TieredCache, TTLCache
+
+
+def row_count(path, namespace):
+    with sqlite3.connect(str(path)) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (namespace,)
+        ).fetchone()[0]
+
+
+def test_close_flushes_queued_writes(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = SQLiteCache(path, namespace="works", ttl=60)
+    for number in range(50):
+        cache.set(f"OL{number}W", {"title": str(number)})
+    cache.close()
+
+    assert row_count(path, "works") == 50
+
+
+def test_purge_trims_namespace_to_max_rows(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = SQLiteCache(path, namespace="works", ttl=60, max_rows=3)
+    other = SQLiteCache(path, namespace="authors", ttl=60)
+    cache.PURGE_EVERY = 5
+    other.set("OL1A", "Jane Austen")
+    for number in range(5):
+        # Later keys expire later, so the first ones are trimmed
+        cache.set(f"OL{number}W", {"title": str(number)}, ttl=60 + number)
+    cache.close()
+    other.close()
+
+    assert row_count(path, "works") == 3
+    assert row_count(path, "authors") == 1
+    reopened = SQLiteCache(path, namespace="works", ttl=60)
+    assert reopened.get("OL0W") is None
+    assert reopened.get("OL4W") == {"title": "4"}
+    reopened.close()
+
+
+def test_aget_many_reads_missing_keys_from_l2_and_promotes_them(tmp_path):
+    l2 = SQLiteCache(tmp_path / "cache.sqlite3", namespace="authors", ttl=60)
+    cache = TieredCache(TTLCache(maxsize=10, ttl=60), l2)
+    cache.set("OL1A", "Jane Austen")
+    l2.set("OL2A", "Cassandra Austen")
+
+    names = asyncio.run(cache.aget_many(["OL1A", "OL2A", "OL404A"]))
+
+    assert names == {"OL1A": "Jane Austen", "OL2A": "Cassandra Austen"}
+    assert cache.l1.get("OL2A") == "Cassandra Austen"
+    assert l2.stats()["hits"] == 1
+    cache.close()
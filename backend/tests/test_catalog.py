@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints import books
+from app.core import open_library
+from app.db.catalog import get_author_names, get_work_payload, import_dump, iter_dump
+from app.models.catalog import Author, Work
+
+
+def test_iter_dump_skips_malformed_and_invalid_json_lines(sample_dump):
+    records = list(iter_dump(sample_dump))
+
+    keys = [key for _, key, _, _, _ in records]
+    assert keys == ["/authors/OL1A", "/authors/OL2A", "/works/OL1W", "/books/OL1M", "/works/OL2W"]
+    assert "/works/OL9W" not in keys  # too few fields
+    assert "/works/OL8W" not in keys  # invalid JSON
+
+
+def test_import_dump_loads_works_and_authors(catalog_engine, sample_dump):
+    counts = import_dump(catalog_engine, sample_dump, batch_size=1)
+
+    assert counts == {"/type/work": 2, "/type/author": 2}
+    with sessionmaker(catalog_engine)() as db:
+        assert db.get(Work, "OL2W").title == "Unknown Title"
+
+
+def test_catalog_lookups_read_imported_rows(catalog_engine, catalog_async_session, sample_dump):
+    import_dump(catalog_engine, sample_dump)
+
+    async def run():
+        async with catalog_async_session() as db:
+            return (
+                await get_work_payload(db, "OL1W"),
+                await get_work_payload(db, "OL404W"),
+                await get_author_names(db, ["OL1A", "OL2A", "OL404A"]),
+            )
+
+    work, missing_work, authors = asyncio.run(run())
+
+    assert work["title"] == "Pride and Prejudice"
+    assert missing_work is None
+    assert authors == {"OL1A": "Jane Austen", "OL2A": "Cassandra Austen"}
+
+
+def test_reimport_is_idempotent_and_updates_rows(catalog_engine, sample_dump, tmp_path):
+    import_dump(catalog_engine, sample_dump, batch_size=2)
+    import_dump(catalog_engine, sample_dump, batch_size=2)
+
+    # A newer dump revises the title of a work we already imported
+    updated_dump = tmp_path / "updated.txt.gz"
+    with gzip.open(sample_dump, "rt", encoding="utf-8") as source:
+        text = source.read().replace("Pride and Prejudice", "Pride & Prejudice")
+    with gzip.open(updated_dump, "wt", encoding="utf-8") as target:
+        target.write(text)
+    import_dump(catalog_engine, updated_dump, batch_size=2)
+
+    with sessionmaker(catalog_engine)() as db:
+        assert db.scalar(select(func.count()).select_from(Work)) == 2
+        assert db.scalar(select(func.count()).select_from(Author)) == 2
+        assert db.get(Work, "OL1W").title == "Pride & Prejudice"
+
+
+def test_fetch_work_and_authors_read_local_catalog_first(catalog_engine, catalog_async_session, sample_dump, monkeypatch):
+    import_dump(catalog_engine, sample_dump)
+    monkeypatch.setattr(books, "AsyncSessionLocal", catalog_async_session)
+    monkeypatch.setattr(books.settings, "LOCAL_CATALOG_ENABLED", True)
+    monkeypatch.setattr(books.db_state, "ready", True)
+    books.work_cache.clear()
+    books.author_cache.clear()
+
+    upstream_calls = []
+
+    def upstream(request):
+        upstream_calls.append(str(request.url))
+        return httpx.Response(500)
+
+    async def run():
+        open_library._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        try:
+            work = await books.fetch_work("OL1W")
+            authors = await books.resolve_authors(["OL1A", "OL2A"])
+        finally:
+            await open_library.shutdown()
+        return work, authors
+
+    work, authors = asyncio.run(run())
+
+    assert work["title"] == "Pride and Prejudice"
+    assert authors == [
+        {"key": "OL1A", "name": "Jane Austen"},
+        {"key": "OL2A", "name": "Cassandra Austen"},
+    ]
+    assert upstream_calls == []
+
+
+def test_local_catalog_is_skipped_until_the_database_is_ready(monkeypatch):
+    async def loader():
+        raise AssertionError("the catalog should not be queried")
+
+    monkeypatch.setattr(books.settings, "LOCAL_CATALOG_ENABLED", True)
+    monkeypatch.setattr(books.db_state, "ready", False)
+
+    assert asyncio.run(books.fetch_local(loader)) is None
+
+
+def test_slow_local_catalog_lookup_counts_as_a_miss(monkeypatch):
+    async def loader():
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(books.settings, "LOCAL_CATALOG_ENABLED", True)
+    monkeypatch.setattr(books.settings, "LOCAL_CATALOG_TIMEOUT", 0.01)
+    monkeypatch.setattr(books.db_state, "ready", True)
+
+    assert asyncio.run(books.fetch_local(loader)) is None
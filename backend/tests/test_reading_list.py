@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.endpoints.reading_list import add_many_to_reading_list
+from app.models.reading_list import ReadingListItem
+from app.models.user import User
+from app.schemas.reading_list import ReadingListBatchCreate
+
+
+def run_batch(tmp_path, *batches):
+    """Run each batch through add_many_to_reading_list against a fresh SQLite DB"""
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'reading_list.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                SQLModel.metadata.create_all, tables=[User.__table__, ReadingListItem.__table__]
+            )
+        user = SimpleNamespace(id=1)
+        responses = []
+        try:
+            for batch in batches:
+                async with AsyncSession(engine, expire_on_commit=False) as db:
+                    responses.append(await add_many_to_reading_list(
+                        ReadingListBatchCreate(items=batch), current_user=user, db=db
+                    ))
+        finally:
+            await engine.dispose()
+        return responses
+
+    return asyncio.run(run())
+
+
+def book(book_id):
+    return {"book_id": book_id, "title": f"Title {book_id}", "author": "Jane Austen"}
+
+
+def test_empty_batch_creates_nothing(tmp_path):
+    (response,) = run_batch(tmp_path, [])
+
+    assert response == {"created": 0, "duplicates": 0, "results": []}
+
+
+def test_batch_reports_existing_and_repeated_books_as_duplicates(tmp_path):
+    first, second = run_batch(
+        tmp_path,
+        [book("OL1W")],
+        [book("OL1W"), book("OL2W"), book("OL2W")],
+    )
+
+    assert first["created"] == 1
+    assert (second["created"], second["duplicates"]) == (1, 2)
+    assert [result["status"] for result in second["results"]] == ["duplicate", "created", "duplicate"]
+    assert second["results"][1]["item"].book_id == "OL2W"
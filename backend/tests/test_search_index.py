@@ -0,0 +1,16 @@
+from app.core.search_index import SearchIndex
+
+
+def test_add_prefers_newer_values_and_fills_gaps_from_existing():
+    index = SearchIndex(max_docs=10)
+    # A reading-list entry with free-text author and no ISBNs
+    index.add({"key": "/works/OL1W", "title": "Frankenstein", "author_name": ["FH"], "cover_i": 42, "isbn": []})
+    # The Open Library search doc arrives later without a cover
+    index.add({"key": "/works/OL1W", "title": "Frankenstein", "author_name": ["Mary Shelley"], "isbn": ["9780141439471"]})
+
+    doc = index.docs["/works/OL1W"]
+    assert doc["author_name"] == ["Mary Shelley"]
+    assert doc["cover_i"] == 42
+    assert index.search("shelley", "author")[0] == 1
+    assert index.search("fh", "author")[0] == 0
+    assert index.search("9780141439471", "isbn")[0] == 1